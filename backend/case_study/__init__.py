@@ -7,5 +7,7 @@ EXAMPLE_FOLDERS = [
     "2021_03_24_Beaudesert"
 ]
 
-from .load_example import load_example
-from .upload_file import handle_file_upload
\ No newline at end of file
+from .hydrography import merge_hydrography_with_ground_truth
+from .load_example import load_example, read_example_groups
+from .upload_file import (handle_file_upload, read_vector_upload, read_hydrography_upload, get_upload_key,
+                          UPLOAD_TYPES)
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+# (No third-party library imports)
+
+# Local/Application-Specific Imports
+from backend.utils.geometry import union_geodataframes
+
+
+def merge_hydrography_with_ground_truth(ground_truth_gdf, hydrography_gdf):
+    # Clustered union of both layers in the ground truth CRS, memoized by the input geometries
+    merged_gdf = union_geodataframes(ground_truth_gdf, hydrography_gdf).copy()
+
+    # Preserve attributes from ground truth
+    for col in ground_truth_gdf.columns:
+        if col != 'geometry':
+            merged_gdf[col] = ground_truth_gdf[col].iloc[0]  # Assuming we want to keep the first value
+
+    return merged_gdf
@@ -3,30 +3,62 @@ import os
 from datetime import datetime
 
 # Third-Party Library Imports
-import geopandas as gpd
 import streamlit as st
 
 # Local/Application-Specific Imports
 from backend.case_study import NUM_SETS, EXAMPLE_FOLDERS
-from backend.obs_group import initialize_observation_groups, update_observation_group
+from backend.case_study.hydrography import merge_hydrography_with_ground_truth
+from backend.obs_group import initialize_observation_groups, update_observation_group, fingerprint_observation_group
+from backend.utils.geometry import read_layers
 
 
-def load_example():
-    initialize_observation_groups(NUM_SETS)
-    for i, folder in enumerate(EXAMPLE_FOLDERS):
-        if i >= NUM_SETS:
-            break
+EXAMPLE_LAYERS = ['aoi', 'ground_truth', 'hydrographyA']
+
+
+@st.cache_resource(show_spinner=False)
+def read_example_groups():
+    """
+    Reads, merges and fingerprints the example observation groups once per server process.
+
+    The returned groups are shared between all sessions and must be treated as read-only. Updating a session's
+    observation group with them only copies references.
+
+    Returns:
+        list: Observation group dictionaries with 'aoi', 'ground_truth', 'label' and 'date'.
+    """
+    folders = EXAMPLE_FOLDERS[:NUM_SETS]
+    paths = {
+        (folder, layer): os.path.join("example_data", folder, f"{layer}.shp")
+        for folder in folders
+        for layer in EXAMPLE_LAYERS
+        if os.path.exists(os.path.join("example_data", folder, f"{layer}.shp"))
+    }
+    layers = read_layers(paths)
 
-        folder_path = os.path.join("example_data", folder)
+    groups = []
+    for folder in folders:
+        aoi = layers[(folder, 'aoi')]
+        ground_truth = layers[(folder, 'ground_truth')]
 
-        # Load AOI and Ground Truth
-        aoi = gpd.read_file(os.path.join(folder_path, "aoi.shp"))
-        ground_truth = gpd.read_file(os.path.join(folder_path, "ground_truth.shp"))
+        # Merge example hydrography into the ground truth
+        hydrography = layers.get((folder, 'hydrographyA'))
+        if hydrography is not None:
+            ground_truth = merge_hydrography_with_ground_truth(ground_truth, hydrography)
 
         # Set observation date and label from folder name
         date_str, label = folder.split("_", 3)[:3], folder.split("_", 3)[3]
         date = datetime.strptime("_".join(date_str), "%Y_%m_%d").date()
 
-        update_observation_group(i, aoi=aoi, ground_truth=ground_truth, label=label, date=date)
+        group = {'aoi': aoi, 'ground_truth': ground_truth, 'label': label, 'date': date}
+        fingerprint_observation_group(group)  # Memoized in the group, shared with every session
+        groups.append(group)
+
+    return groups
+
+
+def load_example():
+    initialize_observation_groups(NUM_SETS)
+    for i, example_group in enumerate(read_example_groups()):
+        update_observation_group(i, **example_group)
 
     st.toast("Example data initialized successfully!")
@@ -1,36 +1,139 @@
 # Standard Library Imports
+import io
 import os
-from tempfile import TemporaryDirectory
+import zipfile
 
 # Third-Party Library Imports
 import geopandas as gpd
+import pyogrio
 import streamlit as st
 
 # Local/Application-Specific Imports
-from backend.obs_group import update_observation_group
+from backend.obs_group import update_observation_group, get_observation_group
+from backend.case_study.hydrography import merge_hydrography_with_ground_truth
+
+
+UPLOAD_TYPES = ["shp", "dbf", "shx", "prj", "cpg", "zip", "gpkg", "parquet"]
+SHAPEFILE_COMPONENTS = [".shp", ".shx", ".dbf"]
+
+# Layers a single GeoPackage (layer names) or GeoParquet ('layer' column) upload can carry together
+LAYER_COLUMN = 'layer'
+LAYER_NAMES = ('aoi', 'ground_truth', 'hydrography')
+
+
+def get_upload_key(uploaded_files):
+    # Identifies an upload across reruns without reading its content
+    if not uploaded_files:
+        return None
+    return tuple((getattr(f, 'file_id', None), f.name, f.size) for f in uploaded_files)
+
+
+def _zip_shapefile_components(uploaded_files):
+    # Pack a loose .shp/.shx/.dbf(/.prj) set into an in-memory zip that GDAL reads through /vsizip/
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for uploaded_file in uploaded_files:
+            archive.writestr(uploaded_file.name, uploaded_file.getvalue())
+    return buffer.getvalue()
+
+
+def _split_layers(gdf):
+    if LAYER_COLUMN not in gdf.columns:
+        return {None: gdf}
+    return {str(name): layer.drop(columns=LAYER_COLUMN).reset_index(drop=True)
+            for name, layer in gdf.groupby(LAYER_COLUMN, sort=False)}
+
+
+def read_vector_upload(uploaded_files):
+    """
+    Reads uploaded vector data from memory, without writing it to disk.
+
+    Accepts a zipped shapefile, a GeoPackage, a GeoParquet file or a loose shapefile component set. GeoPackages
+    with layers named like LAYER_NAMES and GeoParquet files with a 'layer' column are split into those layers.
+
+    Args:
+        uploaded_files (list): Streamlit UploadedFile objects.
+
+    Returns:
+        dict: Layer names as keys (None for single-layer uploads) and GeoDataFrames as values.
+
+    Raises:
+        ValueError: If the upload is incomplete or of an unsupported type.
+    """
+    names = [uploaded_file.name.lower() for uploaded_file in uploaded_files]
+    extensions = {os.path.splitext(name)[1] for name in names}
+
+    if len(uploaded_files) == 1 and names[0].endswith('.parquet'):
+        # GeoParquet is decoded by Arrow straight from the buffer
+        return _split_layers(gpd.read_parquet(io.BytesIO(uploaded_files[0].getvalue())))
+
+    if len(uploaded_files) == 1 and names[0].endswith('.gpkg'):
+        data = uploaded_files[0].getvalue()
+        layers = [layer for layer, _ in pyogrio.list_layers(io.BytesIO(data))]
+        named_layers = [layer for layer in layers if layer in LAYER_NAMES]
+        if named_layers:
+            return {layer: gpd.read_file(io.BytesIO(data), layer=layer, engine='pyogrio', use_arrow=True)
+                    for layer in named_layers}
+        return _split_layers(gpd.read_file(io.BytesIO(data), layer=layers[0], engine='pyogrio', use_arrow=True))
+
+    if len(uploaded_files) == 1 and names[0].endswith('.zip'):
+        data = uploaded_files[0].getvalue()
+    elif all(extension in extensions for extension in SHAPEFILE_COMPONENTS):
+        data = _zip_shapefile_components(uploaded_files)
+    else:
+        raise ValueError("Please upload all necessary shapefile components (.shp, .shx, .dbf), "
+                         "or a single .zip, .gpkg or .parquet file.")
+
+    # pyogrio serves in-memory zips through GDAL's virtual filesystem
+    return _split_layers(gpd.read_file(io.BytesIO(data), engine='pyogrio', use_arrow=True))
 
 
 def handle_file_upload(uploaded_files, key, group_index):
     if uploaded_files is not None and len(uploaded_files) > 0:
-        with TemporaryDirectory() as tmpdir:
-            for uploaded_file in uploaded_files:
-                file_path = os.path.join(tmpdir, uploaded_file.name)
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-
-            required_files = [".shp", ".shx", ".dbf"]
-            uploaded_filenames = [uploaded_file.name for uploaded_file in uploaded_files]
-
-            if all(any(fname.endswith(ext) for fname in uploaded_filenames) for ext in required_files):
-                try:
-                    shapefile_path = next(fname for fname in uploaded_filenames if fname.endswith(".shp"))
-                    shapefile_gdf = gpd.read_file(os.path.join(tmpdir, shapefile_path))
-
-                    update_key = 'aoi' if key.startswith('aoi') else 'ground_truth'
-                    update_observation_group(group_index, **{update_key: shapefile_gdf})
-
-                    st.success(f"{update_key.capitalize()} loaded successfully!")
-                except Exception as e:
-                    st.error(f"Error loading {update_key}: {str(e)}")
-            else:
-                st.error(f"Please upload all necessary shapefile components (.shp, .shx, .dbf).")
\ No newline at end of file
+        update_key = 'aoi' if key.startswith('aoi') else 'ground_truth'
+
+        # Uploads are only read once, reruns with the same files keep the group as it is
+        upload_key = get_upload_key(uploaded_files)
+        uploads = get_observation_group(group_index).get('_uploads', {})
+        if uploads.get(update_key) == upload_key:
+            return
+
+        try:
+            layers = read_vector_upload(uploaded_files)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        except Exception as e:
+            st.error(f"Error loading {update_key}: {str(e)}")
+            return
+
+        update_observation_group(group_index, _uploads={**uploads, update_key: upload_key})
+
+        if None in layers:
+            update_observation_group(group_index, **{update_key: layers[None]})
+            st.success(f"{update_key.capitalize()} loaded successfully!")
+            return
+
+        # Multi-layer upload, e.g. one GeoParquet with AOI, ground truth and hydrography
+        update_observation_group(group_index, **{name: layers[name] for name in ('aoi', 'ground_truth') if name in layers})
+        ground_truth = get_observation_group(group_index).get('ground_truth')
+        if 'hydrography' in layers and ground_truth is not None:
+            update_observation_group(group_index, ground_truth=merge_hydrography_with_ground_truth(
+                ground_truth, layers['hydrography']))
+        st.success(f"Loaded layers {', '.join(layers)} successfully!")
+
+
+def read_hydrography_upload(uploaded_files):
+    """
+    Reads a hydrography upload, see read_vector_upload.
+
+    Returns:
+        gpd.GeoDataFrame: The hydrography layer, or None if nothing usable was uploaded.
+    """
+    if not uploaded_files:
+        return None
+    try:
+        layers = read_vector_upload(uploaded_files)
+    except Exception:
+        return None
+    return layers.get('hydrography', layers.get(None))
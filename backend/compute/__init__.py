@@ -0,0 +1,6 @@
+from .base import ComputeBackend, HISTOGRAM_BUCKETS, PERCENTILES
+from .feature_graph import resolve_feature_graph
+from .local import LocalRasterBackend, RasterScene, load_scene
+from .registry import COMPUTE_BACKENDS, DEFAULT_COMPUTE_BACKEND, register_compute_backend, get_compute_backend
+
+register_compute_backend('Local Raster', LocalRasterBackend)
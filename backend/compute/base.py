@@ -0,0 +1,93 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+# (No third-party library imports)
+
+# Local/Application-Specific Imports
+# (No local/application-specific imports)
+
+
+# Statistics format shared by all backends, see ComputeBackend.reduce_stats
+HISTOGRAM_BUCKETS = 50
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+class ComputeBackend:
+    """
+    Interface of a feature computation backend.
+
+    A backend builds the feature stack of an observation group and runs every computation on it that the
+    pages need: reduceRegion-style statistics, point sampling, correlation matrices and map thumbnails.
+    The feature stack is an opaque, backend-specific object that is stored in the group as 'feature_image'.
+
+    Earth Engine is the exception: its computations batch requests across groups on dedicated paths, and the
+    call sites only dispatch sampling_grid to it, see EarthEngineBackend.
+    """
+
+    name = None
+
+    def feature_stack(self, group, features):
+        """
+        Builds the feature stack of a group.
+
+        Args:
+            group (dict): Observation group.
+            features (list): List of feature band names.
+
+        Returns:
+            object: Backend-specific feature stack.
+        """
+        raise NotImplementedError
+
+    def reduce_stats(self, group, feature_image, features):
+        """
+        Computes per-band statistics inside the group AOI.
+
+        Returns:
+            dict: Feature names as keys, dictionaries with 'min', 'max', 'mean', 'std', 'percentiles' (keyed
+                by PERCENTILES) and 'histogram' (up to HISTOGRAM_BUCKETS 'bucketMeans' and 'histogram') as values.
+        """
+        raise NotImplementedError
+
+    def sample_points(self, group, feature_image, sampled_points_df, features):
+        """
+        Samples the feature stack at the given points.
+
+        Args:
+            sampled_points_df (pd.DataFrame): Points with 'lon', 'lat' and 'class' columns and optionally
+                integer 'sample_id's.
+
+        Returns:
+            tuple: X (pd.DataFrame with one column per feature) and y (pd.DataFrame with a 'label' column),
+                indexed by the sample id (or row position) of the points. Points on masked pixels are dropped.
+        """
+        raise NotImplementedError
+
+    def sampling_grid(self, group, feature_image):
+        """
+        Returns the pixel grid sample_points reads the feature stack on, so samples can be snapped to it.
+
+        Returns:
+            tuple: Affine transform (a, b, c, d, e, f) as in rasterio and the CRS of the grid, or None if the
+                grid is unknown.
+        """
+        return None
+
+    def correlation_matrix(self, group, feature_image, features, method='pearson'):
+        """
+        Computes the F x F correlation matrix of the features inside the group AOI.
+
+        Returns:
+            np.ndarray: Correlation matrix.
+        """
+        raise NotImplementedError
+
+    def thumbnail(self, group, feature_image, feature, vis_params):
+        """
+        Renders one band of the feature stack with the given vis params.
+
+        Returns:
+            tuple: RGBA image as np.ndarray of shape (rows, cols, 4) and its extent (min_x, max_x, min_y, max_y).
+        """
+        raise NotImplementedError
@@ -0,0 +1,48 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+# (No third-party library imports)
+
+# Local/Application-Specific Imports
+# (No local/application-specific imports)
+
+
+def resolve_feature_graph(graph, requested):
+    """
+    Builds the requested nodes of a feature graph and, lazily, only the nodes they depend on.
+
+    A feature graph maps every node (input data, intermediate result or feature band) to a tuple of the names
+    of its inputs and a function that builds the node from these inputs. Every node is built at most once, so
+    shared sub-expressions (e.g. VV2 used by VV2_VH2 and VV2_plus_VH2) are reused.
+
+    Example:
+        graph = {
+            'VV': ((), load_vv),
+            'VV2': (('VV',), lambda VV: VV ** 2),
+        }
+        resolve_feature_graph(graph, ['VV2'])  # {'VV2': ...}, builds VV once
+
+    Args:
+        graph (dict): Node names as keys and (inputs, build function) tuples as values.
+        requested (list): Names of the nodes to build.
+
+    Returns:
+        dict: The requested node names as keys and the built nodes as values, in the requested order.
+    """
+    built = {}
+
+    def build(node, path=()):
+        if node in built:
+            return built[node]
+        if node not in graph:
+            raise KeyError(f"Unknown feature '{node}'.")
+        if node in path:
+            raise ValueError(f"Circular feature dependency: {' -> '.join(path + (node,))}.")
+
+        inputs, build_function = graph[node]
+        built[node] = build_function(*[build(name, path + (node,)) for name in inputs])
+        return built[node]
+
+    return {node: build(node) for node in requested}
+
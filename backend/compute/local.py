@@ -0,0 +1,242 @@
+# Standard Library Imports
+import os
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import CRS, Transformer
+from scipy.stats import rankdata
+from matplotlib import colors as mcolors
+
+# Local/Application-Specific Imports
+from backend.utils.geometry import METERS_PER_DEGREE
+from .base import ComputeBackend, HISTOGRAM_BUCKETS, PERCENTILES
+from .feature_graph import resolve_feature_graph
+
+
+class RasterScene:
+    """
+    Co-registered raster bands on a north-up grid.
+
+    Attributes:
+        bands (dict): Band names as keys and 2D float32 arrays of equal shape as values.
+        transform (tuple): Affine (a, b, c, d, e, f) as in rasterio, x = a * col + c and y = e * row + f.
+        crs (str): CRS of the grid, e.g. 'EPSG:4326'.
+    """
+
+    def __init__(self, bands, transform, crs='EPSG:4326'):
+        self.bands = {name: np.asarray(band, dtype=np.float32) for name, band in bands.items()}
+        self.transform = tuple(transform)
+        self.crs = crs
+
+        if self.transform[1] != 0 or self.transform[3] != 0:
+            raise ValueError("Rotated raster grids are not supported.")
+
+    @property
+    def shape(self):
+        return next(iter(self.bands.values())).shape
+
+    @property
+    def bounds(self):
+        a, _, c, _, e, f = self.transform
+        rows, cols = self.shape
+        xs = (c, c + a * cols)
+        ys = (f, f + e * rows)
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def select(self, features):
+        return RasterScene({feature: self.bands[feature] for feature in features}, self.transform, self.crs)
+
+    def pixel_centers(self):
+        a, _, c, _, e, f = self.transform
+        rows, cols = self.shape
+        x = c + a * (np.arange(cols) + 0.5)
+        y = f + e * (np.arange(rows) + 0.5)
+        return np.meshgrid(x, y)
+
+    def pixel_size_m(self):
+        # Pixel size in meters, approximated at the scene center for geographic grids
+        a, _, _, _, e, _ = self.transform
+        if CRS.from_user_input(self.crs).is_geographic:
+            center_lat = (self.bounds[1] + self.bounds[3]) / 2
+            return abs(a) * METERS_PER_DEGREE * np.cos(np.radians(center_lat)), abs(e) * METERS_PER_DEGREE
+        return abs(a), abs(e)
+
+    def to_pixel(self, x, y):
+        a, _, c, _, e, f = self.transform
+        cols = np.floor((np.asarray(x) - c) / a).astype(np.int64)
+        rows = np.floor((np.asarray(y) - f) / e).astype(np.int64)
+        return rows, cols
+
+
+def load_scene(path):
+    """
+    Loads a pre-downloaded scene from GeoTIFFs.
+
+    Args:
+        path (str): Either a directory with one single-band GeoTIFF per band (e.g. VV.tif, VH.tif, angle.tif,
+            DEM.tif), or a multi-band GeoTIFF whose band descriptions are the band names.
+
+    Returns:
+        RasterScene: The loaded scene.
+    """
+    try:
+        import rasterio
+    except ImportError as e:
+        raise ImportError("Loading local scenes requires rasterio (pip install rasterio).") from e
+
+    bands = {}
+    transform = crs = None
+
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(('.tif', '.tiff')))
+        for band_path in paths:
+            with rasterio.open(band_path) as src:
+                bands[os.path.splitext(os.path.basename(band_path))[0]] = _read_masked(src, 1)
+                transform, crs = src.transform, src.crs
+    else:
+        with rasterio.open(path) as src:
+            for index, description in enumerate(src.descriptions, start=1):
+                bands[description or f'b{index}'] = _read_masked(src, index)
+            transform, crs = src.transform, src.crs
+
+    if not bands:
+        raise ValueError(f"No GeoTIFF bands found in {path}.")
+
+    return RasterScene(bands, tuple(transform)[:6], crs.to_string())
+
+
+def _read_masked(src, index):
+    band = src.read(index, masked=True).astype(np.float32)
+    return band.filled(np.nan)
+
+
+def compute_terrain(dem, pixel_size_m):
+    """
+    Computes slope and aspect in degrees like ee.Algorithms.Terrain, aspect clockwise from north.
+    """
+    dx, dy = pixel_size_m
+    dz_drow, dz_dcol = np.gradient(dem, dy, dx)
+    dz_dnorth = -dz_drow  # Rows increase towards the south
+    slope = np.degrees(np.arctan(np.hypot(dz_dcol, dz_dnorth)))
+    aspect = np.degrees(np.arctan2(-dz_dcol, -dz_dnorth)) % 360
+    return slope.astype(np.float32), aspect.astype(np.float32)
+
+
+# Feature graph with the same nodes as the Earth Engine one, on NumPy arrays
+LOCAL_FEATURE_GRAPH = {
+    'VV': (('scene',), lambda scene: scene.bands['VV']),
+    'VH': (('scene',), lambda scene: scene.bands['VH']),
+    'angle': (('scene',), lambda scene: scene.bands['angle']),
+    'DEM': (('scene',), lambda scene: scene.bands['DEM']),
+    'VV2': (('VV',), lambda VV: VV ** 2),
+    'VH2': (('VH',), lambda VH: VH ** 2),
+    'VV2_VH2': (('VV2', 'VH2'), lambda VV2, VH2: VV2 * VH2),
+    'VV2_plus_VH2': (('VV2', 'VH2'), lambda VV2, VH2: VV2 + VH2),
+    'VV_plus_VH': (('VV', 'VH'), lambda VV, VH: VV + VH),
+    'terrain': (('DEM', 'scene'), lambda DEM, scene: compute_terrain(DEM, scene.pixel_size_m())),
+    'slope': (('terrain',), lambda terrain: terrain[0]),
+    'aspect': (('terrain',), lambda terrain: terrain[1]),
+}
+
+
+def _apply_palette(values, vis_params):
+    vmin, vmax = vis_params.get('min', np.nanmin(values)), vis_params.get('max', np.nanmax(values))
+    palette = ['#' + color.lstrip('#') for color in vis_params.get('palette', ['000000', 'FFFFFF'])]
+    cmap = mcolors.LinearSegmentedColormap.from_list('vis', palette)
+
+    scaled = (values - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(values)
+    rgba = cmap(np.clip(np.nan_to_num(scaled), 0, 1))
+    rgba[..., 3] = np.where(np.isfinite(values), 1.0, 0.0)
+    return (rgba * 255).astype(np.uint8)
+
+
+class LocalRasterBackend(ComputeBackend):
+    """
+    Compute backend on pre-downloaded scenes held in memory as NumPy arrays.
+
+    Each group needs a 'scene_path' (see load_scene) with the VV, VH, angle and DEM bands. All derived bands
+    and statistics are computed with vectorized NumPy.
+    """
+
+    name = 'local'
+
+    def feature_stack(self, group, features):
+        scene = load_scene(group['scene_path'])
+        graph = {**LOCAL_FEATURE_GRAPH, 'scene': ((), lambda: scene)}
+
+        return RasterScene(resolve_feature_graph(graph, features), scene.transform, scene.crs)
+
+    def _aoi_mask(self, group, feature_image):
+        aoi = group['aoi'].to_crs(feature_image.crs).geometry.union_all()
+        x, y = feature_image.pixel_centers()
+        return shapely.contains_xy(aoi, x, y)
+
+    def _masked_values(self, group, feature_image, features):
+        mask = self._aoi_mask(group, feature_image)
+        return {feature: feature_image.bands[feature][mask] for feature in features}
+
+    def reduce_stats(self, group, feature_image, features):
+        stats = {}
+        for feature, values in self._masked_values(group, feature_image, features).items():
+            values = values[np.isfinite(values)]
+            if values.size == 0:
+                stats[feature] = {'min': None, 'max': None, 'mean': None, 'std': None,
+                                  'percentiles': {p: None for p in PERCENTILES}, 'histogram': {}}
+                continue
+
+            counts, edges = np.histogram(values, bins=HISTOGRAM_BUCKETS)
+            stats[feature] = {
+                'min': float(values.min()),
+                'max': float(values.max()),
+                'mean': float(values.mean()),
+                'std': float(values.std()),
+                'percentiles': dict(zip(PERCENTILES, np.percentile(values, PERCENTILES).tolist())),
+                'histogram': {
+                    'bucketMeans': ((edges[:-1] + edges[1:]) / 2).tolist(),
+                    'bucketMin': float(edges[0]),
+                    'bucketWidth': float(edges[1] - edges[0]),
+                    'histogram': counts.tolist()
+                }
+            }
+        return stats
+
+    def sample_points(self, group, feature_image, sampled_points_df, features):
+        x, y = sampled_points_df['lon'].to_numpy(), sampled_points_df['lat'].to_numpy()
+        if not CRS.from_user_input(feature_image.crs).equals(CRS.from_epsg(4326)):
+            x, y = Transformer.from_crs('EPSG:4326', feature_image.crs, always_xy=True).transform(x, y)
+
+        rows, cols = feature_image.to_pixel(x, y)
+        n_rows, n_cols = feature_image.shape
+        inside = (rows >= 0) & (rows < n_rows) & (cols >= 0) & (cols < n_cols)
+
+        X = np.full((len(sampled_points_df), len(features)), np.nan, dtype=np.float32)
+        for j, feature in enumerate(features):
+            X[inside, j] = feature_image.bands[feature][rows[inside], cols[inside]]
+
+        # Drop points outside the scene or on masked pixels, as sampleRegions does
+        valid = np.isfinite(X).all(axis=1)
+        if 'sample_id' in sampled_points_df:
+            ids = sampled_points_df['sample_id'].to_numpy()[valid]
+        else:
+            ids = np.flatnonzero(valid)
+        X = pd.DataFrame(X[valid], columns=features, index=ids)
+        y = pd.DataFrame({'label': sampled_points_df['class'].to_numpy()[valid].astype(int)}, index=ids)
+        return X, y
+
+    def sampling_grid(self, group, feature_image):
+        return feature_image.transform, feature_image.crs
+
+    def correlation_matrix(self, group, feature_image, features, method='pearson'):
+        values = np.column_stack(list(self._masked_values(group, feature_image, features).values()))
+        values = values[np.isfinite(values).all(axis=1)]
+
+        if method == 'spearman':
+            values = rankdata(values, axis=0)
+        return np.corrcoef(values, rowvar=False)
+
+    def thumbnail(self, group, feature_image, feature, vis_params):
+        values = np.where(self._aoi_mask(group, feature_image), feature_image.bands[feature], np.nan)
+        min_x, min_y, max_x, max_y = feature_image.bounds
+        return _apply_palette(values, vis_params), (min_x, max_x, min_y, max_y)
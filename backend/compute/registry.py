@@ -0,0 +1,30 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+import streamlit as st
+
+# Local/Application-Specific Imports
+# (No local/application-specific imports)
+
+
+DEFAULT_COMPUTE_BACKEND = 'Earth Engine'
+
+COMPUTE_BACKENDS = {}
+_instances = {}
+
+
+def register_compute_backend(name, backend_class):
+    COMPUTE_BACKENDS[name] = backend_class
+
+
+def get_compute_backend(name=None):
+    """
+    Returns the compute backend instance registered under name, by default the one selected in the session.
+    """
+    if name is None:
+        name = st.session_state.get('compute_backend', DEFAULT_COMPUTE_BACKEND)
+
+    if name not in _instances:
+        _instances[name] = COMPUTE_BACKENDS[name]()
+    return _instances[name]
@@ -1,6 +1,17 @@
-from .features.feature_stack import add_feature_image_to_group
-from .features.feature_min_max import add_feature_min_max
-from .features.correlation import compute_pairwise_correlations_for_groups, create_average_absolute_correlation_matrix
+from .features.feature_stack import add_feature_image_to_group, build_feature_image
+from .features.feature_stats import add_feature_stats_to_groups, prefetch_feature_stats
+from .features.feature_min_max import add_feature_min_max, add_feature_min_max_to_groups
+from .features.correlation import (compute_pairwise_correlations_for_groups, compute_correlation_matrices_for_groups,
+                                   correlation_matrix_to_pairs, create_average_absolute_correlation_matrix)
 from .features.importance import get_importances
+from .batch import RequestBatch, resolve_batch
+from .client import EEClient, get_ee_client, get_info
 from .utils import convert_observation_groups_to_ee
-from .tools.initialize_ee import initialize_rfmapp
\ No newline at end of file
+from .preflight import run_coverage_preflight
+from .prefetch import get_prefetch_status
+from .tools.initialize_ee import initialize_rfmapp
+
+from backend.compute import register_compute_backend
+from .compute_backend import EarthEngineBackend
+
+register_compute_backend('Earth Engine', EarthEngineBackend)
@@ -0,0 +1,110 @@
+# Standard Library Imports
+import json
+
+# Third-Party Library Imports
+import ee
+
+# Local/Application-Specific Imports
+from backend.utils.result_cache import ee_fingerprint, MISSING
+from backend.ee.client import get_info
+
+
+def _encode_key(key):
+    # ee.Dictionary only accepts string keys, tuples are serialized to a stable JSON string
+    if isinstance(key, str):
+        return key
+    return json.dumps(list(key) if isinstance(key, tuple) else key, default=str)
+
+
+class RequestBatch:
+    """
+    Collects pending Earth Engine computations and resolves them in a single server round trip.
+
+    Every computation added to the batch is stored under a (string or tuple) key. Calling resolve()
+    packs all pending computations into one ee.Dictionary and fetches it with a single getInfo() call.
+
+    Example:
+        batch = RequestBatch()
+        batch.add(('Grafton', 'VV'), image.reduceRegion(...))
+        batch.add(('Maitland', 'VV'), image.reduceRegion(...))
+        results = batch.resolve()  # {('Grafton', 'VV'): {...}, ('Maitland', 'VV'): {...}}
+    """
+
+    def __init__(self):
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, key):
+        return _encode_key(key) in self._pending
+
+    def add(self, key, computed_object, cache_key=None):
+        """
+        Adds a computation to the batch.
+
+        Args:
+            key (str | tuple): Key under which the resolved value is returned.
+            computed_object (ee.ComputedObject): The Earth Engine computation to resolve.
+            cache_key (str, optional): Observation group fingerprint the computation depends on. Used together
+                with the expression itself as persistent cache key when resolve() is given a cache.
+
+        Returns:
+            str | tuple: The key, for convenience.
+        """
+        self._pending[_encode_key(key)] = (key, computed_object, cache_key)
+        return key
+
+    def resolve(self, cache=None):
+        """
+        Resolves all pending computations in one round trip and clears the batch.
+
+        Args:
+            cache (ResultCache, optional): Persistent result cache. Cached computations are not sent to the
+                server, newly resolved ones are stored.
+
+        Returns:
+            dict: Resolved client-side values keyed by the keys passed to add().
+        """
+        if not self._pending:
+            return {}
+
+        pending, self._pending = self._pending, {}
+        resolved = {}
+        fingerprints = {}
+
+        if cache is not None:
+            for encoded, (key, obj, cache_key) in list(pending.items()):
+                fingerprints[encoded] = ee_fingerprint(obj, cache_key)
+                value = cache.get(fingerprints[encoded], MISSING)
+                if value is not MISSING:
+                    resolved[key] = value
+                    del pending[encoded]
+
+        if pending:
+            payload = ee.Dictionary({encoded: obj for encoded, (_, obj, _) in pending.items()})
+            result = get_info(payload)
+
+            for encoded, (key, _, _) in pending.items():
+                resolved[key] = result.get(encoded)
+                if cache is not None:
+                    cache.set(fingerprints[encoded], resolved[key])
+
+        return resolved
+
+
+def resolve_batch(computations, cache=None):
+    """
+    Resolves a mapping of keys to Earth Engine computations in a single round trip.
+
+    Args:
+        computations (dict): Mapping of (string or tuple) keys to ee.ComputedObject instances.
+        cache (ResultCache, optional): Persistent result cache.
+
+    Returns:
+        dict: Resolved client-side values with the same keys.
+    """
+    batch = RequestBatch()
+    for key, computed_object in computations.items():
+        batch.add(key, computed_object)
+    return batch.resolve(cache=cache)
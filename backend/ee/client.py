@@ -0,0 +1,115 @@
+# Standard Library Imports
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-Party Library Imports
+import ee
+import streamlit as st
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# Local/Application-Specific Imports
+from backend.utils.result_cache import fingerprint
+
+
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('RFMAPP_EE_CONCURRENCY', 8))
+MAX_ATTEMPTS = 5
+
+# Error messages of transient Earth Engine failures that are worth retrying
+RETRYABLE_ERRORS = ('too many concurrent', 'rate limit', 'quota', '429', 'timed out', 'deadline',
+                    'internal error', 'service unavailable', '503')
+
+
+def is_retryable_error(error):
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return isinstance(error, ee.EEException) and any(message in str(error).lower() for message in RETRYABLE_ERRORS)
+
+
+@retry(retry=retry_if_exception(is_retryable_error),
+       stop=stop_after_attempt(MAX_ATTEMPTS),
+       wait=wait_exponential_jitter(initial=1, max=30),
+       reraise=True)
+def get_info(computed_object):
+    """
+    Resolves an Earth Engine computation, retrying transient failures with exponential backoff.
+    """
+    return computed_object.getInfo()
+
+
+class EEClient:
+    """
+    Thread pool for independent Earth Engine requests.
+
+    The pool size caps the number of concurrent requests. Calls submitted with the same key while a previous
+    call is still in flight are coalesced into that call (single flight). Submitted functions run outside the
+    Streamlit script thread and must not access st.session_state or render elements.
+    """
+
+    def __init__(self, max_workers=MAX_CONCURRENT_REQUESTS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ee-client')
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, key=None, **kwargs):
+        """
+        Submits function(*args, **kwargs) to the pool.
+
+        Args:
+            key (str, optional): Single-flight key. If a call with the same key is in flight, its future is
+                returned instead of starting a new call.
+
+        Returns:
+            concurrent.futures.Future: Future of the result.
+        """
+        if key is None:
+            return self._executor.submit(function, *args, **kwargs)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(function, *args, **kwargs)
+            self._in_flight[key] = future
+
+        # Registered outside the lock, the callback runs immediately in this thread if the call already finished
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def get_info(self, computed_object):
+        """
+        Resolves a computation on the pool. Identical in-flight expressions are resolved once.
+
+        Returns:
+            concurrent.futures.Future: Future of the client-side value.
+        """
+        return self.submit(get_info, computed_object, key=fingerprint('get_info', computed_object.serialize()))
+
+    def map(self, function, *iterables, keys=None):
+        """
+        Runs function concurrently over the iterables and returns the results in order.
+
+        Args:
+            keys (list, optional): Single-flight key of each call.
+
+        Returns:
+            list: The results. The first exception raised by a call is re-raised.
+        """
+        calls = list(zip(*iterables))
+        keys = keys if keys is not None else [None] * len(calls)
+        futures = [self.submit(function, *args, key=key) for args, key in zip(calls, keys)]
+        return [future.result() for future in futures]
+
+
+@st.cache_resource(show_spinner=False)
+def get_ee_client(max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Returns the process-wide Earth Engine client.
+    """
+    return EEClient(max_workers=max_workers)
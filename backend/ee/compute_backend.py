@@ -0,0 +1,29 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+# (No third-party library imports)
+
+# Local/Application-Specific Imports
+from backend.compute import ComputeBackend
+import backend.sampling.compile_data as compile_data
+from backend.utils.geometry import METERS_PER_DEGREE
+
+
+class EarthEngineBackend(ComputeBackend):
+    """
+    Compute backend on Google Earth Engine. The feature stack is a lazily evaluated ee.Image.
+
+    Feature images, statistics, samples, correlations and maps are computed on the batched and cached Earth
+    Engine request paths (add_feature_image_to_group, add_feature_stats_to_groups, get_group_X_y, the
+    correlation module and plot_ee_image), which batch requests across groups. Call sites take these paths for
+    this backend, so it only implements the methods that are dispatched to it.
+    """
+
+    name = 'ee'
+
+    def sampling_grid(self, group, feature_image):
+        # The composites have the default EPSG:4326 projection, sampleRegions reads them at SAMPLE_SCALE meters
+        # per pixel at the equator on a grid anchored at (0, 0)
+        size = compile_data.SAMPLE_SCALE / METERS_PER_DEGREE
+        return (size, 0, 0, 0, -size, 0), 'EPSG:4326'
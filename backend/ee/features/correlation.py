@@ -5,9 +5,12 @@ import ee
 import numpy as np
 
 # Local/Application-Specific Imports
+from backend.ee.batch import RequestBatch
+from backend.obs_group import hash_single_observation_group
+from backend.utils.result_cache import get_result_cache
 
 
-def compute_pairwise_correlations_for_groups(groups, features, reducer):
+def compute_pairwise_correlations_for_groups(groups, features, reducer, use_disk_cache=False):
     """
     Computes the pairwise correlations for the specified features across all groups.
 
@@ -15,13 +18,16 @@ def compute_pairwise_correlations_for_groups(groups, features, reducer):
         groups (list): List of group dictionaries.
         features (list): List of feature names to compute correlations.
         _reducer (ee.Reducer): The reducer to use for computing correlations.
+        use_disk_cache (bool): Whether to use the persistent result cache.
 
     Returns:
         dict: A dictionary with group labels as keys and lists of correlation data as values.
     """
-    correlations = {group['label']: [] for group in groups}
+    batch = RequestBatch()
 
+    # Queue every pair of every group, then resolve them together in a single round trip
     for group in groups:
+        group_hash = hash_single_observation_group(group)
         for i, f1 in enumerate(features):
             for j, f2 in enumerate(features):
                 if i < j:
@@ -30,23 +36,102 @@ def compute_pairwise_correlations_for_groups(groups, features, reducer):
                         geometry=group['aoi_ee'],
                         scale=30,
                         maxPixels=1e9
-                    ).get('correlation').getInfo()
-                    correlations[group['label']].append((f1, f2, correlation))
+                    ).get('correlation')
+                    batch.add((group['label'], f1, f2), correlation, cache_key=group_hash)
+
+    resolved = batch.resolve(cache=get_result_cache() if use_disk_cache else None)
+
+    correlations = {group['label']: [] for group in groups}
+    for (label, f1, f2), correlation in resolved.items():
+        correlations[label].append((f1, f2, correlation))
 
     return correlations
 
 
+def covariance_to_correlation(covariance):
+    """
+    Normalizes a covariance matrix to a correlation matrix.
+
+    Args:
+        covariance (np.ndarray): F x F covariance matrix.
+
+    Returns:
+        np.ndarray: F x F correlation matrix, NaN where a feature has zero variance.
+    """
+    covariance = np.asarray(covariance, dtype=float)
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.outer(std, std)
+    correlation[~np.isfinite(correlation)] = np.nan
+    return np.clip(correlation, -1, 1)
+
+
+def compute_correlation_matrices_for_groups(groups, features, use_disk_cache=False):
+    """
+    Computes the full Pearson correlation matrix of the specified features for every group.
+
+    Each group is reduced once with ee.Reducer.centeredCovariance() over the array image of all features,
+    and all groups are resolved in a single round trip. The covariance is normalized locally.
+
+    Args:
+        groups (list): List of group dictionaries.
+        features (list): List of feature names to compute correlations.
+        use_disk_cache (bool): Whether to use the persistent result cache.
+
+    Returns:
+        dict: A dictionary with group labels as keys and F x F correlation matrices as values.
+    """
+    batch = RequestBatch()
+
+    for group in groups:
+        array_image = group['feature_image'].select(list(features)).toArray()
+        covariance = array_image.reduceRegion(
+            reducer=ee.Reducer.centeredCovariance(),
+            geometry=group['aoi_ee'],
+            scale=30,
+            maxPixels=1e9
+        ).get('array')
+        batch.add(group['label'], covariance, cache_key=hash_single_observation_group(group))
+
+    resolved = batch.resolve(cache=get_result_cache() if use_disk_cache else None)
+
+    return {label: covariance_to_correlation(covariance) for label, covariance in resolved.items()}
+
+
+def correlation_matrix_to_pairs(matrix, features):
+    """
+    Converts a correlation matrix to a list of (feature_1, feature_2, correlation) tuples for i < j.
+
+    Args:
+        matrix (np.ndarray): F x F correlation matrix.
+        features (list): List of feature names.
+
+    Returns:
+        list: List of correlation tuples, in the same order as compute_pairwise_correlations_for_groups.
+    """
+    rows, cols = np.triu_indices(len(features), k=1)
+    return [(features[i], features[j], float(matrix[i, j])) for i, j in zip(rows, cols)]
+
+
 def create_average_absolute_correlation_matrix(correlations, features):
     """
     Creates an average absolute correlation matrix from all groups.
 
     Args:
-        correlations (dict): Dictionary with group labels as keys and lists of correlation data as values.
+        correlations (dict): Dictionary with group labels as keys and either lists of correlation data
+            or F x F correlation matrices as values.
         features (list): List of feature names.
 
     Returns:
         np.ndarray: Average absolute correlation matrix.
     """
+    if correlations and all(isinstance(corr, np.ndarray) for corr in correlations.values()):
+        stacked = np.abs(np.stack(list(correlations.values())))
+        count_matrix = np.sum(~np.isnan(stacked), axis=0)
+        avg_abs_matrix = np.nansum(stacked, axis=0) / np.maximum(count_matrix, 1)
+        np.fill_diagonal(avg_abs_matrix, 1)
+        return avg_abs_matrix
+
     n = len(features)
     avg_abs_matrix = np.zeros((n, n))
     count_matrix = np.zeros((n, n))
@@ -2,51 +2,45 @@
 # (No standard library imports)
 
 # Third-Party Library Imports
-import streamlit as st
-import ee
+# (No third-party library imports)
 
 # Local/Application-Specific Imports
 from backend.obs_group import update_observation_group
+from backend.ee.features.feature_stats import add_feature_stats_to_groups
 
 
 
-def get_image_min_max(_group, group_hash, feature):
-    image = _group['feature_image'].select(feature)
-    # Calculate min and max
-    min_max = image.reduceRegion(
-        reducer=ee.Reducer.minMax(),
-        geometry=_group['aoi_ee'],
-        scale=50,  # Adjust as needed
-        maxPixels=1e9
-    ).getInfo()
+def get_min_max_from_stats(feature_stats):
+    return {feature: {'min': stats['min'], 'max': stats['max']} for feature, stats in feature_stats.items()}
 
-    return min_max
 
+def add_feature_min_max(i, group, features, group_hash, use_disk_cache=False):
+    # Min/max values are read from the shared per-group statistics stage
+    feature_stats = add_feature_stats_to_groups([group], features, group_indices=[i],
+                                                use_disk_cache=use_disk_cache)[0]
+    min_max_dict = get_min_max_from_stats(feature_stats)
 
-def add_feature_min_max(i, group, features, group_hash):
-    # Check if we have a cache for min-max values
-    if 'min_max_cache' not in st.session_state:
-        st.session_state.min_max_cache = {}
-
-    min_max_dict = {}
+    # Update the group's session state
+    update_observation_group(i, feature_min_max=min_max_dict)
+    return min_max_dict
 
-    for feature in features:
-        cache_key = (group_hash, feature)  # Create a unique key for this feature and group hash combination
 
-        if cache_key in st.session_state.min_max_cache:
-            # If we have cached values for this feature, use them
-            min_max = st.session_state.min_max_cache[cache_key]
-        else:
-            # If not, calculate and cache the values for this feature
-            min_max = get_image_min_max(group, group_hash, feature)
-            st.session_state.min_max_cache[cache_key] = min_max
+def add_feature_min_max_to_groups(groups, features, use_disk_cache=False):
+    """
+    Adds the feature min/max values to all groups from the shared per-group statistics stage.
 
-        min_max_dict[feature] = {
-            'min': min_max[f'{feature}_min'],
-            'max': min_max[f'{feature}_max']
-        }
+    Args:
+        groups (list): List of observation group dictionaries.
+        features (list): List of feature names.
+        use_disk_cache (bool): Whether to use the persistent result cache.
 
-    # Update the group's session state
-    update_observation_group(i, feature_min_max=min_max_dict)
-    return min_max_dict
+    Returns:
+        list: The min/max dictionary of each group.
+    """
+    min_max_dicts = []
+    for i, feature_stats in enumerate(add_feature_stats_to_groups(groups, features, use_disk_cache=use_disk_cache)):
+        min_max_dict = get_min_max_from_stats(feature_stats)
+        update_observation_group(i, feature_min_max=min_max_dict)
+        min_max_dicts.append(min_max_dict)
 
+    return min_max_dicts
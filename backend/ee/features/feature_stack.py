@@ -6,72 +6,78 @@ import ee
 
 # Local/Application-Specific Imports
 from backend.obs_group import *
+from backend.compute.feature_graph import resolve_feature_graph
 
 
-def add_feature_image_to_group(i, group, msg_col):
-    date = group.get('date', 'Unknown date')
-    label = group['label']
-    aoi_ee = group['aoi_ee']
-    start_date_ee = group['start_date_ee']
-    end_date_ee = group['end_date_ee']
-    all_features = st.session_state.all_features
-
+def get_s1_collection(aoi_ee, start_date_ee, end_date_ee):
     # Get Sentinel-1 data
-    s1 = ee.ImageCollection('COPERNICUS/S1_GRD') \
+    return ee.ImageCollection('COPERNICUS/S1_GRD') \
         .filterBounds(aoi_ee) \
         .filterDate(start_date_ee, end_date_ee) \
         .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VV')) \
         .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VH'))
 
-    # Check coverage
-    count = s1.size().getInfo()
-    if count == 0:
-        msg_col.error(f'No Sentinel-1 imagery available for {label} ({date}).', icon="⚠")
-        st.stop()
 
-    # Create Sentinel-1 mosaic
-    s1 = s1.mosaic().clip(aoi_ee)
+# Feature graph: every node declares its inputs and how it is built from them
+EE_FEATURE_GRAPH = {
+    'VV': (('s1',), lambda s1: s1.select('VV')),
+    'VH': (('s1',), lambda s1: s1.select('VH')),
+    'angle': (('s1',), lambda s1: s1.select('angle')),
+    'VV2': (('VV',), lambda VV: VV.pow(2)),
+    'VH2': (('VH',), lambda VH: VH.pow(2)),
+    'VV2_VH2': (('VV2', 'VH2'), lambda VV2, VH2: VV2.multiply(VH2)),
+    'VV2_plus_VH2': (('VV2', 'VH2'), lambda VV2, VH2: VV2.add(VH2)),
+    'VV_plus_VH': (('VV', 'VH'), lambda VV, VH: VV.add(VH)),
+    'terrain': (('DEM',), lambda DEM: ee.Algorithms.Terrain(DEM)),
+    'slope': (('terrain',), lambda terrain: terrain.select('slope')),
+    'aspect': (('terrain',), lambda terrain: terrain.select('aspect')),
+}
+
+
+def build_feature_image(aoi_ee, start_date_ee, end_date_ee, features):
+    """
+    Builds the feature image of an AOI and observation date without any server round trip.
+
+    Only the requested bands and the intermediate images they depend on are added to the expression graph,
+    e.g. the Sentinel-1 mosaic is skipped for terrain-only selections and the terrain algorithm is only
+    applied when slope or aspect are requested.
+
+    Args:
+        aoi_ee (ee.Geometry): Area of interest.
+        start_date_ee (ee.Date): Start of the observation window.
+        end_date_ee (ee.Date): End of the observation window.
+        features (list): List of feature band names.
+
+    Returns:
+        ee.Image: Image with one band per feature, clipped to the AOI.
+    """
+    graph = {
+        **EE_FEATURE_GRAPH,
+        # Sentinel-1 mosaic and DEM
+        's1': ((), lambda: get_s1_collection(aoi_ee, start_date_ee, end_date_ee).mosaic().clip(aoi_ee)),
+        'DEM': ((), lambda: ee.Image('MERIT/DEM/v1_0_3').select('dem').clip(aoi_ee).rename('DEM')),
+    }
 
-    # Check if imagery fully covers the AOI
-    mosaic_bbox = s1.geometry()
-    aoi_contained = mosaic_bbox.contains(aoi_ee).getInfo()
+    bands = resolve_feature_graph(graph, features)
+    feature_image = ee.Image.cat([image.rename(feature) for feature, image in bands.items()])
 
-    if aoi_contained:
-        msg_col.success(f'Sentinel-1 imagery for {label} ({date}) fully covers the AOI.')
-    else:
-        msg_col.warning(f'Sentinel-1 imagery for {label} ({date}) does not fully cover the AOI.', icon="⚠")
-
-    # Get DEM
-    dem = ee.Image('MERIT/DEM/v1_0_3').select('dem').clip(aoi_ee).rename('DEM')
-
-    feature_image = ee.Image()
-
-    # Define all possible bands and their corresponding images
-    VV = s1.select('VV')
-    VH = s1.select('VH')
-    VV2 = VV.pow(2)
-    VH2 = VH.pow(2)
-
-    terrain = ee.Algorithms.Terrain(dem)
-
-    feature_calculation = {
-        'VV': VV,
-        'VH': VH,
-        'angle': s1.select('angle'),
-        'VV2_VH2': VV2.multiply(VH2),
-        'VV2_plus_VH2': VV2.add(VH2),
-        'VV_plus_VH': VV.add(VH),
-        'DEM': dem,
-        'slope': terrain.select('slope'),
-        'aspect': terrain.select('aspect')
-    }
+    return feature_image.clip(aoi_ee)
 
-    # Add requested bands
-    for feature, image in feature_calculation.items():
-        if feature in feature_calculation:
-            feature_image = feature_image.addBands(image.rename(feature))
 
-    # Remove 'constant' band if it exists
-    feature_image = feature_image.select(all_features).clip(aoi_ee)
+def add_feature_image_to_group(i, group, msg_col, coverage, features):
+    # coverage is the group's entry of the coverage preflight report (see run_coverage_preflight), features
+    # are the bands to build, the same list as in the feature image artifact params
+    date = group.get('date', 'Unknown date')
+    label = group['label']
+
+    if coverage['status'] == 'missing':
+        msg_col.error(f'No Sentinel-1 imagery available for {label} ({date}).', icon="⚠")
+        st.stop()
+
+    if coverage['status'] == 'covered':
+        msg_col.success(f'Sentinel-1 imagery for {label} ({date}) fully covers the AOI.')
+    else:
+        msg_col.warning(f'Sentinel-1 imagery for {label} ({date}) covers only {coverage["coverage"]:.0%} of the AOI.',
+                        icon="⚠")
 
-    return feature_image
+    return build_feature_image(group['aoi_ee'], group['start_date_ee'], group['end_date_ee'], features)
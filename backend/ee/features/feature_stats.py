@@ -0,0 +1,183 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+import streamlit as st
+import ee
+
+# Local/Application-Specific Imports
+from backend.obs_group import (update_observation_group, is_artifact_current, update_artifact,
+                               get_artifact_fingerprint)
+from backend.ee.prefetch import submit_prefetch, get_prefetched, prune_prefetch_jobs
+from backend.ee.batch import RequestBatch
+from backend.utils.result_cache import get_result_cache
+from backend.compute import get_compute_backend, HISTOGRAM_BUCKETS, PERCENTILES
+
+
+STATS_SCALE = 50
+
+
+def get_stats_reducer():
+    """
+    Creates the combined reducer used for all per-band statistics.
+
+    Returns:
+        ee.Reducer: minMax + mean + stdDev + percentiles + histogram, sharing their inputs.
+    """
+    return (ee.Reducer.minMax()
+            .combine(ee.Reducer.mean(), sharedInputs=True)
+            .combine(ee.Reducer.stdDev(), sharedInputs=True)
+            .combine(ee.Reducer.percentile(PERCENTILES), sharedInputs=True)
+            .combine(ee.Reducer.histogram(maxBuckets=HISTOGRAM_BUCKETS), sharedInputs=True))
+
+
+def get_image_stats(_group, features):
+    # One pass of the combined reducer over all requested bands
+    return _group['feature_image'].select(list(features)).reduceRegion(
+        reducer=get_stats_reducer(),
+        geometry=_group['aoi_ee'],
+        scale=STATS_SCALE,
+        maxPixels=1e9
+    )
+
+
+def parse_feature_stats(result, features):
+    """
+    Converts the flat reduceRegion output of the combined reducer into per-feature statistics.
+
+    Args:
+        result (dict): Client-side reduceRegion result with '<band>_<statistic>' keys.
+        features (list): List of feature names.
+
+    Returns:
+        dict: Feature names as keys, dictionaries with 'min', 'max', 'mean', 'std', 'percentiles' and
+            'histogram' as values.
+    """
+    result = result or {}
+    stats = {}
+    for feature in features:
+        stats[feature] = {
+            'min': result.get(f'{feature}_min'),
+            'max': result.get(f'{feature}_max'),
+            'mean': result.get(f'{feature}_mean'),
+            'std': result.get(f'{feature}_stdDev'),
+            'percentiles': {p: result.get(f'{feature}_p{p}') for p in PERCENTILES},
+            'histogram': result.get(f'{feature}_histogram') or {}
+        }
+    return stats
+
+
+def fetch_feature_stats(group, features, backend_name, image_fingerprint, cache=None):
+    """
+    Computes the statistics of a group's features without touching st, e.g. in a prefetch job.
+
+    Args:
+        group (dict): Observation group with 'feature_image' (and 'aoi_ee' on Earth Engine).
+        features (tuple): Feature names.
+        backend_name (str): Name of the compute backend.
+        image_fingerprint (str): Fingerprint of the feature image artifact, the key of the cached reduction.
+        cache (ResultCache, optional): Persistent result cache to look up and store the reduction in.
+
+    Returns:
+        dict: Statistics per feature, as returned by parse_feature_stats.
+    """
+    backend = get_compute_backend(backend_name)
+    if backend.name != 'ee':
+        return backend.reduce_stats(group, group['feature_image'], list(features))
+
+    batch = RequestBatch()
+    batch.add('stats', get_image_stats(group, features), cache_key=image_fingerprint)
+    resolved = batch.resolve(cache=cache)
+    return parse_feature_stats(resolved['stats'], features)
+
+
+def get_stats_prefetch_key(group):
+    return 'stats', get_artifact_fingerprint(group, 'feature_image')
+
+
+def prefetch_feature_stats(groups, features, backend_name, use_disk_cache=False):
+    """
+    Starts background jobs computing the statistics of all features of all groups.
+
+    The histograms, map vis params and boxplots of the features page are read from these statistics, and
+    add_feature_stats_to_groups attaches to the jobs instead of reducing the same bands again.
+
+    Args:
+        groups (list): Observation groups with feature images.
+        features (list): Feature names.
+        backend_name (str): Name of the compute backend.
+        use_disk_cache (bool): Whether to use the persistent result cache.
+    """
+    keys = [get_stats_prefetch_key(group) for group in groups]
+    prune_prefetch_jobs(keys)
+    # Resolved here, the jobs run on the EE client threads and must not access st
+    cache = get_result_cache() if use_disk_cache else None
+    for group, key in zip(groups, keys):
+        _, image_fingerprint = key
+        submit_prefetch(key, fetch_feature_stats, group, tuple(features), backend_name, image_fingerprint, cache)
+
+
+def add_feature_stats_to_groups(groups, features, group_indices=None, use_disk_cache=False):
+    """
+    Adds per-band statistics to all groups with one combined reduction per group.
+
+    Statistics are cached per feature image fingerprint and feature, so a feature image rebuilt for another
+    backend or scene never reuses the statistics of the previous one. Only the missing features are reduced, and the
+    reductions of all groups are resolved in a single round trip. The result is stored in the group as
+    'feature_stats', which the map vis params, histograms and boxplots read from.
+
+    Args:
+        groups (list): List of observation group dictionaries.
+        features (list): List of feature names.
+        group_indices (list, optional): Observation group index of each group. Defaults to the position in groups.
+        use_disk_cache (bool): Whether to look up and store the reductions in the persistent result cache.
+
+    Returns:
+        list: The feature statistics dictionary of each group.
+    """
+    if group_indices is None:
+        group_indices = range(len(groups))
+
+    if 'feature_stats_cache' not in st.session_state:
+        st.session_state.feature_stats_cache = {}
+    cache = st.session_state.feature_stats_cache
+
+    backend = get_compute_backend()
+    batch = RequestBatch()
+    image_fingerprints = [get_artifact_fingerprint(group, 'feature_image') for group in groups]
+    missing = []
+    local_stats = {}
+    for i, (group, image_fingerprint) in enumerate(zip(groups, image_fingerprints)):
+        missing_features = [feature for feature in features if (image_fingerprint, feature) not in cache]
+        if missing_features:
+            # Attach to the background job of this feature image, if one was started
+            for feature, feature_stats in (get_prefetched(get_stats_prefetch_key(group)) or {}).items():
+                cache[(image_fingerprint, feature)] = feature_stats
+            missing_features = [feature for feature in features if (image_fingerprint, feature) not in cache]
+
+        if missing_features and backend.name == 'ee':
+            batch.add(i, get_image_stats(group, missing_features), cache_key=image_fingerprint)
+        elif missing_features:
+            local_stats[i] = backend.reduce_stats(group, group['feature_image'], missing_features)
+        missing.append(missing_features)
+
+    resolved = batch.resolve(cache=get_result_cache() if use_disk_cache else None)
+
+    all_stats = []
+    for i, (group_index, image_fingerprint) in enumerate(zip(group_indices, image_fingerprints)):
+        if i in local_stats:
+            new_stats = local_stats[i]
+        else:
+            new_stats = parse_feature_stats(resolved.get(i), missing[i])
+        for feature, feature_stats in new_stats.items():
+            cache[(image_fingerprint, feature)] = feature_stats
+
+        group_stats = {feature: cache[(image_fingerprint, feature)] for feature in features}
+        if is_artifact_current(group, 'stats'):
+            update_observation_group(group_index, feature_stats=group_stats)
+        else:
+            # First statistics of this feature image, figures of the previous one are dropped
+            update_artifact(group_index, 'stats', feature_stats=group_stats)
+        all_stats.append(group_stats)
+
+    return all_stats
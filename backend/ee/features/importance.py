@@ -14,18 +14,24 @@ from sklearn.inspection import permutation_importance
 
 
 def add_random_col(X, use_high_card_col, use_low_card_col):
-    X_random = X.copy()
+    # Appends random reference columns to a feature matrix, returns the matrix and the names of the new columns
+    columns, names = [X], []
 
     if use_high_card_col:
         high_card_random = np.random.RandomState(42).randint(0, 10000, X.shape[0])
-        X_random['HIGH_CARD_RANDOM'] = high_card_random
+        columns.append(high_card_random[:, np.newaxis])
+        names.append('HIGH_CARD_RANDOM')
 
     if use_low_card_col:
         low_card_random = np.random.RandomState(42).randint(0, 10, X.shape[0])
-        X_random['LOW_CARD_RANDOM'] = low_card_random
+        columns.append(low_card_random[:, np.newaxis])
+        names.append('LOW_CARD_RANDOM')
 
-    return X_random
-@st.cache_data()
+    return np.hstack(columns).astype(np.float32, copy=False), names
+
+
+# Fold stores are hashed by their content fingerprint instead of by pickling the sample matrix
+@st.cache_data(hash_funcs={'backend.model_selection.logo_cv.FoldStore': lambda folds: folds.fingerprint})
 def get_importances(folds, importance_proxies, use_high_card_col, use_low_card_col, features):
     impurity_importances = []
     permutation_importances = []
@@ -41,23 +47,20 @@ def get_importances(folds, importance_proxies, use_high_card_col, use_low_card_c
         progress = (fold_idx + 1) / total_folds
         progress_bar.progress(progress, text=f"Evaluating Feature Importance for Fold {fold_idx}")
 
-        X_train, y_train = fold['X_train'], fold['y_train']
-        X_test, y_test = fold['X_test'], fold['y_test']
-
         # Select only the specified features
-        X_train = X_train[features]
-        X_test = X_test[features]
+        X_train, y_train = fold.X_train(features), fold.y_train()
+        X_test, y_test = fold.X_test(features), fold.y_test()
 
         # Add random columns
-        X_train_random = add_random_col(X_train, use_high_card_col, use_low_card_col)
-        X_test_random = add_random_col(X_test, use_high_card_col, use_low_card_col)
+        X_train_random, random_names = add_random_col(X_train, use_high_card_col, use_low_card_col)
+        X_test_random, _ = add_random_col(X_test, use_high_card_col, use_low_card_col)
 
         # Update feature names
-        feature_names = X_train_random.columns.tolist()
+        feature_names = list(features) + random_names
 
         # Train model
         model = RandomForestClassifier(n_estimators=100, random_state=42)
-        model.fit(X_train_random, y_train['label'])  # Assuming 'label' is the column name for y
+        model.fit(X_train_random, y_train)
 
         for importance_proxy in importance_proxies:
             if importance_proxy == 'Impurity Reduction':
@@ -65,7 +68,7 @@ def get_importances(folds, importance_proxies, use_high_card_col, use_low_card_c
                 impurity_importances.append(impurity_importance)
 
             elif importance_proxy == 'Permutation Accuracy':
-                result = permutation_importance(model, X_test_random, y_test['label'], n_repeats=50, random_state=42)
+                result = permutation_importance(model, X_test_random, y_test, n_repeats=50, random_state=42)
                 perm_importance = pd.Series(result.importances_mean, index=feature_names)
                 permutation_importances.append(perm_importance)
 
@@ -82,6 +85,6 @@ def get_importances(folds, importance_proxies, use_high_card_col, use_low_card_c
     aggregated_X_test = None
     if 'Shapley' in importance_proxies:
         aggregated_shap_values = np.concatenate(SHAP_values_per_fold)
-        aggregated_X_test = pd.concat(X_test_per_fold, axis=0)
+        aggregated_X_test = pd.DataFrame(np.concatenate(X_test_per_fold), columns=feature_names)
 
-    return impurity_importances, permutation_importances, aggregated_shap_values, aggregated_X_test, feature_names
\ No newline at end of file
+    return impurity_importances, permutation_importances, aggregated_shap_values, aggregated_X_test, feature_names
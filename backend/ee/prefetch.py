@@ -0,0 +1,70 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+import streamlit as st
+
+# Local/Application-Specific Imports
+from backend.ee.client import get_ee_client
+
+
+def get_prefetch_jobs():
+    if 'prefetch_jobs' not in st.session_state:
+        st.session_state.prefetch_jobs = {}
+    return st.session_state.prefetch_jobs
+
+
+def submit_prefetch(key, function, *args, **kwargs):
+    """
+    Starts a background job on the Earth Engine client unless a job with the same key was started before.
+
+    The key doubles as single-flight key, so an identical on-demand request attaches to the running job.
+    Failed jobs are kept as well, so a permanent failure is not resubmitted on every rerun. The function runs
+    outside the script thread and must not access st.
+
+    Args:
+        key (tuple): Job key, e.g. ('stats', feature image fingerprint).
+        function (callable): The job.
+
+    Returns:
+        concurrent.futures.Future: Future of the job.
+    """
+    jobs = get_prefetch_jobs()
+    if key not in jobs:
+        jobs[key] = get_ee_client().submit(function, *args, key=key, **kwargs)
+    return jobs[key]
+
+
+def get_prefetched(key):
+    """
+    Waits for a prefetch job and returns its result.
+
+    Returns:
+        The result, or None if no job was started for the key or the job failed, in which case the caller
+        computes the artifact on demand. Failed jobs stay in the job list, see get_prefetch_status.
+    """
+    future = get_prefetch_jobs().get(key)
+    if future is None:
+        return None
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+
+def prune_prefetch_jobs(keys):
+    # Forget jobs of artifacts that no longer exist, e.g. after an AOI changed
+    jobs = get_prefetch_jobs()
+    for key in [key for key in jobs if key not in keys]:
+        del jobs[key]
+
+
+def get_prefetch_status():
+    """
+    Returns:
+        tuple: Number of finished jobs, number of failed jobs and number of all jobs.
+    """
+    futures = list(get_prefetch_jobs().values())
+    done = [future for future in futures if future.done()]
+    failed = [future for future in done if future.exception() is not None]
+    return len(done), len(failed), len(futures)
@@ -0,0 +1,76 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+import ee
+
+# Local/Application-Specific Imports
+from backend.ee.batch import RequestBatch
+from backend.ee.features.feature_stack import get_s1_collection
+
+
+# Mosaics covering at least this fraction of the AOI count as full coverage
+FULL_COVERAGE = 0.999
+MAX_ERROR = 10  # meters
+
+
+def get_coverage_expression(group):
+    """
+    Builds the coverage check of one group as a single ee.Dictionary.
+
+    Returns:
+        ee.Dictionary: 'count' (number of scenes), 'coverage' (fraction of the AOI covered by the scene
+            footprints) and 'ids' (system:index of every scene).
+    """
+    aoi_ee = group['aoi_ee']
+    s1 = get_s1_collection(aoi_ee, group['start_date_ee'], group['end_date_ee'])
+
+    covered_area = s1.geometry(MAX_ERROR).intersection(aoi_ee, MAX_ERROR).area(MAX_ERROR)
+    coverage = ee.Number(covered_area).divide(aoi_ee.area(MAX_ERROR))
+
+    return ee.Dictionary({
+        'count': s1.size(),
+        'coverage': coverage,
+        'ids': s1.aggregate_array('system:index')
+    })
+
+
+def run_coverage_preflight(groups):
+    """
+    Checks the Sentinel-1 coverage of all groups in a single round trip.
+
+    Args:
+        groups (list): List of observation group dictionaries with 'aoi_ee', 'start_date_ee' and 'end_date_ee'.
+
+    Returns:
+        list: One report per group with 'label', 'date', 'count', 'coverage', 'acquisition_ids' and 'status'
+            ('covered', 'partial' or 'missing').
+    """
+    batch = RequestBatch()
+    for i, group in enumerate(groups):
+        batch.add(i, get_coverage_expression(group))
+    resolved = batch.resolve()
+
+    report = []
+    for i, group in enumerate(groups):
+        result = resolved.get(i) or {}
+        count = result.get('count', 0)
+        coverage = min(result.get('coverage') or 0.0, 1.0) if count else 0.0
+
+        if count == 0:
+            status = 'missing'
+        elif coverage >= FULL_COVERAGE:
+            status = 'covered'
+        else:
+            status = 'partial'
+
+        report.append({
+            'label': group.get('label'),
+            'date': group.get('date'),
+            'count': count,
+            'coverage': coverage,
+            'acquisition_ids': result.get('ids', []),
+            'status': status
+        })
+
+    return report
@@ -10,34 +10,38 @@ from backend.obs_group import *
 
 
 def convert_observation_groups_to_ee():
-    all_groups = get_all_observation_groups()
-    total_groups = len(all_groups)
+    # Only groups whose AOI or date changed since the last conversion are converted
+    outdated = [(group_index, group) for group_index, group in enumerate(st.session_state.observation_groups)
+                if group and not is_artifact_current(group, 'aoi_ee')]
+    if not outdated:
+        return
 
     # Create a progress bar
     progress_bar = st.progress(0)
+    progress_index = 0
 
-
-    for group_index, group in enumerate(all_groups):
+    # Geometries of path-backed groups are only loaded for their batch
+    for group_index, group in (item for batch in iter_group_batches(outdated) for item in batch):
         # Update progress bar
-        progress = int((group_index + 1) / total_groups * 100)
+        progress_index += 1
+        progress = int(progress_index / len(outdated) * 100)
         progress_bar.progress(progress)
 
 
-        if 'aoi' in group and isinstance(group['aoi'], gpd.GeoDataFrame) and 'date' in group:
-            aoi = group['aoi']
+        if group.is_valid:
             observation_date = group['date']
 
-            aoi_geojson = aoi.__geo_interface__
-            aoi_ee = ee.Geometry.Polygon(aoi_geojson['features'][0]['geometry']['coordinates'])
+            # Simplified payload of all AOI features, Polygon or MultiPolygon
+            aoi_ee = group.ee_geometry
 
             start_date_ee = ee.Date(observation_date.isoformat())
             end_date_ee = ee.Date((observation_date + timedelta(days=1)).isoformat())
 
             # Update the observation group with the new EE objects
-            update_observation_group(group_index,
-                                                  aoi_ee=aoi_ee,
-                                                  start_date_ee=start_date_ee,
-                                                  end_date_ee=end_date_ee)
+            update_artifact(group_index, 'aoi_ee',
+                            aoi_ee=aoi_ee,
+                            start_date_ee=start_date_ee,
+                            end_date_ee=end_date_ee)
 
         else:
             st.warning(f"Group {group_index + 1} does not have valid AOI or date. Skipping.")
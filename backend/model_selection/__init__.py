@@ -0,0 +1,4 @@
+from .logo_cv import get_logo_folds, FoldStore, Fold
+from .spatial_cv import (INNER_CV_SCHEMES, SpatialCV, SpatialBlockKFold, BufferedKFold, create_inner_cv,
+                         split_inner_cv)
+from .scoring import score_inner_cv, score_outer_cv
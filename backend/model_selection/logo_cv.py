@@ -0,0 +1,174 @@
+import hashlib
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class Fold:
+    """
+    One Leave-One-Group-Out fold as rows of a FoldStore.
+
+    The test rows are a contiguous slice of the store, so X_test() without a feature subset is a view. The
+    training rows are an index array ordered by label, built on first access, and their matrices are gathered
+    on access.
+    """
+
+    __slots__ = ('store', 'test_group', '_train_rows')
+
+    def __init__(self, store, test_group):
+        self.store = store
+        self.test_group = test_group
+        self._train_rows = None
+
+    @property
+    def fingerprint(self):
+        # Store content and test group, e.g. to key caches of per-fold results
+        return f'{self.store.fingerprint}:{self.test_group}'
+
+    @property
+    def train_groups(self):
+        return [j for j in range(len(self.store)) if j != self.test_group]
+
+    @property
+    def test_rows(self):
+        return slice(self.store.offsets[self.test_group], self.store.offsets[self.test_group + 1])
+
+    @property
+    def train_rows(self):
+        # Rows of all other groups, flooded and non-flooded blocks in label order as in the test rows. Built once
+        # per fold, X_train, y_train and coords_train share them.
+        if self._train_rows is None:
+            store = self.store
+            other = store.groups != self.test_group
+            self._train_rows = np.concatenate([np.flatnonzero(other & (store.y == label)) for label in store.labels])
+        return self._train_rows
+
+    def X_train(self, features=None):
+        return self.store.take(self.train_rows, features)
+
+    def y_train(self):
+        return self.store.y[self.train_rows]
+
+    def X_test(self, features=None):
+        return self.store.take(self.test_rows, features)
+
+    def y_test(self):
+        return self.store.y[self.test_rows]
+
+    def coords_train(self):
+        return self.store.take_coordinates(self.train_rows)
+
+    def coords_test(self):
+        return self.store.take_coordinates(self.test_rows)
+
+
+class FoldStore(Sequence):
+    """
+    Samples of all groups in one contiguous float32 matrix with label and group id arrays, and the LOGO folds
+    over them.
+
+    Rows are ordered by group and, within a group, by label. Folds are index arrays and slices into the
+    store, so memory stays linear in the number of samples instead of holding one copy of the data per fold.
+
+    Attributes:
+        X (np.ndarray): Features of shape (N, F), float32.
+        y (np.ndarray): Labels of shape (N,), int8.
+        groups (np.ndarray): Observation group index of each row, int32.
+        coordinates (np.ndarray): Lon/lat of each row of shape (N, 2), or None. Used by spatial inner CV.
+        offsets (np.ndarray): First row of each group, followed by N.
+        feature_names (list): Column names of X.
+    """
+
+    def __init__(self, X, y, groups, feature_names, n_groups=None, coordinates=None):
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.int8)
+        self.groups = np.asarray(groups, dtype=np.int32)
+        self.feature_names = list(feature_names)
+        self.coordinates = None if coordinates is None else np.asarray(coordinates, dtype=np.float64)
+        self.labels = np.unique(self.y)
+        n_groups = self.groups.max(initial=-1) + 1 if n_groups is None else n_groups
+        self.offsets = np.searchsorted(self.groups, np.arange(n_groups + 1))
+        self._fingerprint = None
+
+    @classmethod
+    def from_groups(cls, X_list, y_list, coordinates_list=None):
+        """
+        Builds a store from the per-group X (pd.DataFrame) and y (pd.DataFrame with a 'label' column), and
+        optionally the per-group sample coordinates (pd.DataFrame with 'lon' and 'lat' columns, row-aligned
+        with X).
+        """
+        feature_names = list(X_list[0].columns) if X_list else []
+        X_parts, y_parts, group_parts, coordinate_parts = [], [], [], []
+        for group_index, (X, y) in enumerate(zip(X_list, y_list)):
+            labels = y['label'].to_numpy()
+            order = np.argsort(labels, kind='stable')
+            X_parts.append(X[feature_names].to_numpy(dtype=np.float32)[order])
+            y_parts.append(labels[order])
+            group_parts.append(np.full(len(labels), group_index))
+            if coordinates_list is not None:
+                coordinate_parts.append(coordinates_list[group_index][['lon', 'lat']].to_numpy(dtype=float)[order])
+
+        if not X_parts:
+            return cls(np.empty((0, 0)), np.empty(0), np.empty(0), feature_names)
+        coordinates = np.concatenate(coordinate_parts) if coordinate_parts else None
+        return cls(np.concatenate(X_parts), np.concatenate(y_parts), np.concatenate(group_parts), feature_names,
+                   n_groups=len(X_list), coordinates=coordinates)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return Fold(self, i)
+
+    def columns(self, features):
+        return [self.feature_names.index(feature) for feature in features]
+
+    def take(self, rows, features=None):
+        """
+        Returns the features of the given rows, optionally only the given feature columns in their order.
+        """
+        X = self.X[rows]
+        if features is not None and list(features) != self.feature_names:
+            X = X[:, self.columns(features)]
+        return X
+
+    def take_coordinates(self, rows):
+        return None if self.coordinates is None else self.coordinates[rows]
+
+    @property
+    def fingerprint(self):
+        # Content hash, used as st.cache_data key of functions taking a store
+        if self._fingerprint is None:
+            hasher = hashlib.sha256()
+            for array in (self.X, self.y, self.groups, self.coordinates):
+                hasher.update(array.tobytes() if array is not None else b'')
+            hasher.update('\x1f'.join(self.feature_names).encode())
+            self._fingerprint = hasher.hexdigest()
+        return self._fingerprint
+
+
+def get_logo_folds(observation_groups):
+    """
+    Generate Leave-One-Group-Out (LOGO) folds.
+
+    Parameters:
+    observation_groups (list): List of dictionaries containing 'X' and 'y' DataFrames for each group, and
+        optionally the row-aligned 'sample_coordinates'.
+
+    Returns:
+    folds (FoldStore): Sequence of folds over one shared sample matrix, fold i tests group i.
+    """
+    X_list = [group['X'] for group in observation_groups]
+    y_list = [group['y'] for group in observation_groups]
+
+    coordinates_list = None
+    if all('sample_coordinates' in group for group in observation_groups):
+        coordinates_list = [group['sample_coordinates'] for group in observation_groups]
+
+    return FoldStore.from_groups(X_list, y_list, coordinates_list)
@@ -0,0 +1,35 @@
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+import numpy as np
+
+from .spatial_cv import split_inner_cv
+
+def score_inner_cv(params, X_train, y_train, inner_cv, coords_train=None, n_jobs=None):
+    clf = RandomForestClassifier(**params, random_state=42, n_jobs=n_jobs)
+
+    # Cross-validation logic
+    scores = []
+    for train_idx, val_idx in split_inner_cv(inner_cv, X_train, y_train, coords_train):
+        X_train_inner, X_val_inner = X_train[train_idx], X_train[val_idx]
+        y_train_inner, y_val_inner = y_train[train_idx], y_train[val_idx]
+
+        clf.fit(X_train_inner, y_train_inner)
+        y_pred_inner = clf.predict(X_val_inner)
+        scores.append(f1_score(y_val_inner, y_pred_inner, average='binary'))
+
+    return np.mean(scores)
+
+def score_outer_cv(params, folds, features, n_jobs=None):
+    clf = RandomForestClassifier(**params, random_state=42, n_jobs=n_jobs)
+
+    # Evaluate across all outer folds
+    scores = []
+    for fold in folds:
+        X_train, y_train = fold.X_train(features), fold.y_train()
+        X_test, y_test = fold.X_test(features), fold.y_test()
+
+        clf.fit(X_train, y_train)
+        y_pred = clf.predict(X_test)
+        scores.append(f1_score(y_test, y_pred, average='binary'))
+
+    return np.mean(scores)
@@ -0,0 +1,165 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from sklearn.model_selection import StratifiedKFold
+
+EARTH_RADIUS_M = 6371008.8
+INNER_CV_SCHEMES = ['SKF-CV', 'Spatial Block CV', 'Buffered CV']
+
+
+def lon_lat_to_xyz(coords):
+    """
+    Projects lon/lat degrees to Earth-centered Cartesian meters. Straight-line distances match great-circle
+    distances to well below a meter at buffer scales, anywhere on the globe and across UTM zones.
+    """
+    lon, lat = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    cos_lat = np.cos(lat)
+    return EARTH_RADIUS_M * np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def get_spatial_blocks(coords, block_size):
+    """
+    Assigns lon/lat points to square blocks of about block_size meters on the sphere of lon_lat_to_xyz, with
+    block columns narrowed by the cosine of the block row latitude.
+
+    Returns:
+        np.ndarray: Block id of each point, consecutive integers from 0.
+    """
+    lon, lat = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    rows = np.floor(lat * EARTH_RADIUS_M / block_size)
+    row_lat = (rows + 0.5) * block_size / EARTH_RADIUS_M
+    cols = np.floor(lon * EARTH_RADIUS_M * np.cos(row_lat) / block_size)
+    return np.unique(np.column_stack([rows, cols]), axis=0, return_inverse=True)[1].ravel()
+
+
+def exclude_buffer(train_idx, val_idx, xyz, buffer):
+    # Drop training points within the buffer distance of any validation point, one KD-tree query per point
+    if buffer <= 0 or len(train_idx) == 0 or len(val_idx) == 0:
+        return train_idx
+    distances, _ = cKDTree(xyz[val_idx]).query(xyz[train_idx], k=1, distance_upper_bound=buffer)
+    return train_idx[~np.isfinite(distances)]
+
+
+class SpatialCV:
+    """
+    Base of the cross-validators that need the coordinates of the samples, see split_inner_cv.
+
+    Subclasses assign validation folds in _iter_validation_masks. Training points within buffer meters of a
+    validation point are left out of that split. Splits whose training or validation points miss a class of
+    y raise a ValueError instead of being scored.
+    """
+
+    def __init__(self, n_splits=5, buffer=0, random_state=42):
+        self.n_splits = n_splits
+        self.buffer = buffer
+        self.random_state = random_state
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.n_splits
+
+    def __repr__(self):
+        params = ', '.join(f'{name}={value!r}' for name, value in vars(self).items())
+        return f'{type(self).__name__}({params})'
+
+    def _iter_validation_masks(self, X, y, coords):
+        raise NotImplementedError
+
+    def split(self, X, y, coords):
+        """
+        Yields training and validation indices.
+
+        Args:
+            X (np.ndarray): Features, only used for the number of samples.
+            y (np.ndarray): Class labels.
+            coords (np.ndarray): Lon/lat degrees of shape (N, 2).
+        """
+        y = np.asarray(y)
+        classes = np.unique(y)
+        xyz = lon_lat_to_xyz(np.asarray(coords, dtype=float))
+        for fold, val_mask in enumerate(self._iter_validation_masks(X, y, coords)):
+            train_idx, val_idx = np.flatnonzero(~val_mask), np.flatnonzero(val_mask)
+            if len(np.unique(y[val_idx])) < len(classes):
+                raise ValueError(f"Validation fold {fold + 1} of {self!r} does not hold samples of every class. "
+                                 f"Use smaller blocks or fewer folds.")
+            train_idx = exclude_buffer(train_idx, val_idx, xyz, self.buffer)
+            if len(np.unique(y[train_idx])) < len(classes):
+                raise ValueError(f"The {self.buffer} m buffer leaves no training samples of some class for "
+                                 f"validation fold {fold + 1}. Use a smaller buffer.")
+            yield train_idx, val_idx
+
+
+class SpatialBlockKFold(SpatialCV):
+    """
+    K-fold over square spatial blocks. Blocks are shuffled and assigned greedily to the fold whose class counts
+    they balance best, so nearby points share a fold and every fold holds a share of each class, even where
+    flooded samples cluster in a few blocks.
+    """
+
+    def __init__(self, n_splits=5, block_size=500, buffer=0, random_state=42):
+        super().__init__(n_splits, buffer, random_state)
+        self.block_size = block_size
+
+    def _iter_validation_masks(self, X, y, coords):
+        blocks = get_spatial_blocks(np.asarray(coords, dtype=float), self.block_size)
+        n_blocks = blocks.max(initial=-1) + 1
+        if n_blocks < self.n_splits:
+            raise ValueError(f"The samples fall into {n_blocks} blocks of {self.block_size} m, fewer than "
+                             f"the {self.n_splits} folds. Use smaller blocks or fewer folds.")
+
+        # Samples per block and class, as shares of the class totals
+        class_ids = np.unique(y, return_inverse=True)[1].ravel()
+        block_counts = np.zeros((n_blocks, class_ids.max(initial=-1) + 1))
+        np.add.at(block_counts, (blocks, class_ids), 1)
+        block_shares = block_counts / block_counts.sum(axis=0)
+
+        # Largest blocks first, ties in random order
+        block_sizes = block_counts.sum(axis=1)
+        shuffled = np.random.RandomState(self.random_state).permutation(n_blocks)
+        order = shuffled[np.argsort(-block_sizes[shuffled], kind='stable')]
+
+        # Each block goes to the fold with the smallest sum of squared class shares after adding it, i.e. the
+        # fold that holds the least of the block's classes so far
+        block_folds = np.empty(n_blocks, dtype=int)
+        fold_shares = np.zeros((self.n_splits, block_counts.shape[1]))
+        for block in order:
+            block_folds[block] = fold = np.argmin(((fold_shares + block_shares[block]) ** 2).sum(axis=1))
+            fold_shares[fold] += block_shares[block]
+
+        point_folds = block_folds[blocks]
+        for fold in range(self.n_splits):
+            yield point_folds == fold
+
+
+class BufferedKFold(SpatialCV):
+    """
+    Stratified k-fold with buffered leave-out: training points closer than buffer meters to a validation point
+    are excluded from that split.
+    """
+
+    def _iter_validation_masks(self, X, y, coords):
+        skf = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+        for _, val_idx in skf.split(np.zeros(len(y)), y):
+            val_mask = np.zeros(len(y), dtype=bool)
+            val_mask[val_idx] = True
+            yield val_mask
+
+
+def create_inner_cv(scheme, k_folds, block_size=500, buffer=0):
+    """
+    Creates the inner cross-validator of a scheme in INNER_CV_SCHEMES.
+    """
+    if scheme == 'Spatial Block CV':
+        return SpatialBlockKFold(n_splits=k_folds, block_size=block_size, buffer=buffer)
+    if scheme == 'Buffered CV':
+        return BufferedKFold(n_splits=k_folds, buffer=buffer)
+    return StratifiedKFold(n_splits=k_folds)
+
+
+def split_inner_cv(cv, X, y, coords=None):
+    """
+    Splits with scikit-learn and spatial cross-validators alike, passing the coordinates to the latter.
+    """
+    if isinstance(cv, SpatialCV):
+        if coords is None:
+            raise ValueError("Spatial cross-validation needs the sample coordinates.")
+        return cv.split(X, y, coords)
+    return cv.split(X, y)
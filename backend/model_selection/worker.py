@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+
+from .logo_cv import FoldStore
+from .scoring import score_inner_cv, score_outer_cv
+
+STORE_ARRAYS = ('X', 'y', 'groups', 'coordinates')
+
+# Fold store of a worker process, memory-mapped from the files written by share_fold_store. Spawned workers
+# import this module and the modules of the pickled trial arguments, so this package must not depend on
+# Streamlit, Earth Engine or geopandas, which keeps worker startup cheap and free of side effects.
+_worker_store = None
+
+
+def share_fold_store(store, directory):
+    """
+    Writes the arrays of a fold store to .npy files, which worker processes map into memory instead of
+    receiving a pickled copy per trial.
+
+    Returns:
+        dict: Arguments of load_shared_fold_store.
+    """
+    for name in STORE_ARRAYS:
+        array = getattr(store, name)
+        if array is not None:
+            np.save(os.path.join(directory, f'{name}.npy'), array)
+    return {'directory': directory, 'feature_names': store.feature_names, 'n_groups': len(store)}
+
+
+def load_shared_fold_store(directory, feature_names, n_groups):
+    arrays = {}
+    for name in STORE_ARRAYS:
+        path = os.path.join(directory, f'{name}.npy')
+        arrays[name] = np.load(path, mmap_mode='r') if os.path.exists(path) else None
+    return FoldStore(arrays['X'], arrays['y'], arrays['groups'], feature_names, n_groups=n_groups,
+                     coordinates=arrays['coordinates'])
+
+
+def init_worker(shared_store):
+    global _worker_store
+    _worker_store = load_shared_fold_store(**shared_store)
+
+
+def score_trial(params, cv_type, features, inner_cv):
+    # Runs in a worker process, one tree-building core per worker
+    if cv_type == "Inner Cross-Validation":
+        first_fold = _worker_store[0]
+        return score_inner_cv(params, first_fold.X_train(features), first_fold.y_train(), inner_cv,
+                              first_fold.coords_train(), n_jobs=1)
+    return score_outer_cv(params, _worker_store, features, n_jobs=1)
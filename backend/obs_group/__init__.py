@@ -1,2 +1,6 @@
 
+from .model import ObservationGroup, ObservationGroupRegistry
 from .manage import *
+from .artifacts import *
+from .bulk_import import (GROUP_BATCH_SIZE, GROUPS_PER_PAGE, discover_group_sources, read_manifest,
+                          import_observation_groups, iter_group_batches)
@@ -0,0 +1,165 @@
+# Standard Library Imports
+# (No standard library imports)
+
+# Third-Party Library Imports
+import streamlit as st
+
+# Local/Application-Specific Imports
+from backend.utils.result_cache import fingerprint
+from .manage import fingerprint_observation_group
+
+
+# Artifact graph: every node lists its parent nodes, the keys holding the artifact and whether it is stored
+# per observation group or once per session (derived from all groups).
+ARTIFACT_GRAPH = {
+    'aoi': ((), (), 'group'),  # Source geometries, date and label, never dropped
+    'aoi_ee': (('aoi',), ('aoi_ee', 'start_date_ee', 'end_date_ee'), 'group'),
+    'feature_image': (('aoi_ee',), ('feature_image', 'group_hash'), 'group'),
+    'stats': (('feature_image',), ('feature_stats', 'feature_min_max'), 'group'),
+    'samples': (('feature_image',), ('sample_coordinates', 'X', 'y'), 'group'),
+    'feature_figures': (('stats',), ('feature_maps', 'ridgeline_fig', 'correlation_fig'), 'session'),
+    'folds': (('samples',), ('logo_folds', 'skf'), 'session'),
+    'importances': (('folds',), ('shap_fig', 'impurity_fig', 'permutation_fig'), 'session'),
+    'models': (('folds',), ('optuna_study', 'best_params', 'model_evaluation_results', 'outer_models'), 'session'),
+}
+
+
+def get_artifact_children(node):
+    return [child for child, (parents, _, _) in ARTIFACT_GRAPH.items() if node in parents]
+
+
+def _get_session_artifacts():
+    if 'artifact_fingerprints' not in st.session_state:
+        st.session_state.artifact_fingerprints = {}
+    return st.session_state.artifact_fingerprints
+
+
+def _get_groups():
+    return [group for group in st.session_state.get('observation_groups', []) if group]
+
+
+def _get_records(group, node):
+    # Fingerprint records of the scope the node lives in
+    if ARTIFACT_GRAPH[node][2] == 'session':
+        return _get_session_artifacts()
+    return group.setdefault('artifact_fingerprints', {})
+
+
+def get_artifact_fingerprint(group, node):
+    """
+    Returns the recorded fingerprint of an artifact, or None if it has not been built.
+
+    Args:
+        group (dict): Observation group, ignored for session artifacts.
+        node (str): Artifact name, see ARTIFACT_GRAPH.
+    """
+    if node == 'aoi':
+        return fingerprint_observation_group(group)
+    record = _get_records(group, node).get(node)
+    return record['fingerprint'] if record is not None else None
+
+
+def _get_input_fingerprints(group, node):
+    parents, _, scope = ARTIFACT_GRAPH[node]
+    if scope == 'session':
+        # Session artifacts depend on the parent artifact of every group
+        return [[get_artifact_fingerprint(g, parent) for g in _get_groups()]
+                if ARTIFACT_GRAPH[parent][2] == 'group' else get_artifact_fingerprint(None, parent)
+                for parent in parents]
+    return [get_artifact_fingerprint(group, parent) for parent in parents]
+
+
+def _compute_fingerprint(group, node, params):
+    return fingerprint(node, _get_input_fingerprints(group, node), params)
+
+
+def is_artifact_current(group, node, params=None):
+    """
+    Checks whether an artifact was built from the current parent artifacts and the given parameters.
+
+    Args:
+        group (dict): Observation group, ignored for session artifacts.
+        node (str): Artifact name, see ARTIFACT_GRAPH.
+        params (dict, optional): Parameters the artifact is built with, e.g. the feature list.
+
+    Returns:
+        bool: True if the recorded artifact can be reused.
+    """
+    recorded = get_artifact_fingerprint(group, node)
+    return recorded is not None and recorded == _compute_fingerprint(group, node, params)
+
+
+def invalidate_artifact(group, node):
+    """
+    Drops an artifact and everything derived from it.
+
+    Args:
+        group (dict): Observation group, ignored for session artifacts.
+        node (str): Artifact name, see ARTIFACT_GRAPH.
+    """
+    _, keys, scope = ARTIFACT_GRAPH[node]
+    records = _get_records(group, node)
+    target = st.session_state if scope == 'session' else group
+
+    if node != 'aoi':
+        records.pop(node, None)
+        for key in keys:
+            if key in target:
+                del target[key]
+
+    for child in get_artifact_children(node):
+        invalidate_artifact(group, child)
+
+
+def invalidate_session_artifacts():
+    # Drops everything derived from all groups, e.g. after the groups were replaced
+    for node, (parents, _, scope) in ARTIFACT_GRAPH.items():
+        if scope == 'session' and all(ARTIFACT_GRAPH[parent][2] == 'group' for parent in parents):
+            invalidate_artifact(None, node)
+
+
+def update_artifact(group_index, node, params=None, **values):
+    """
+    Stores a freshly built artifact with its fingerprint and drops the artifacts derived from its previous
+    version.
+
+    Args:
+        group_index (int): Index of the observation group, ignored for session artifacts.
+        node (str): Artifact name, see ARTIFACT_GRAPH.
+        params (dict, optional): Parameters the artifact was built with.
+        **values: Artifact values, stored on the group or in the session state.
+    """
+    _, _, scope = ARTIFACT_GRAPH[node]
+    group = st.session_state.observation_groups[group_index] if scope == 'group' else None
+
+    for child in get_artifact_children(node):
+        invalidate_artifact(group, child)
+
+    target = st.session_state if scope == 'session' else group
+    for key, value in values.items():
+        target[key] = value
+    _get_records(group, node)[node] = {'fingerprint': _compute_fingerprint(group, node, params)}
+
+
+def refresh_artifacts():
+    """
+    Compares the source fingerprint of every group with the recorded one and drops all artifacts derived
+    from changed sources, including the session artifacts built from all groups.
+
+    The source fingerprints are memoized on the groups, so a rerun without changes only compares strings.
+
+    Returns:
+        list: (group index, artifact) pairs that were dropped.
+    """
+    dropped = []
+    for index, group in enumerate(st.session_state.get('observation_groups', [])):
+        if not group:
+            continue
+        records = group.setdefault('artifact_fingerprints', {})
+        source = fingerprint_observation_group(group)
+        if records.get('aoi', {}).get('fingerprint') != source:
+            stale = [node for node in records if node != 'aoi']
+            invalidate_artifact(group, 'aoi')
+            records['aoi'] = {'fingerprint': source}
+            dropped.extend((index, node) for node in stale)
+    return dropped
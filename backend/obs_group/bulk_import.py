@@ -0,0 +1,153 @@
+# Standard Library Imports
+import os
+from datetime import datetime
+
+# Third-Party Library Imports
+import pandas as pd
+import streamlit as st
+
+# Local/Application-Specific Imports
+from .model import ObservationGroup, ObservationGroupRegistry
+from .artifacts import invalidate_session_artifacts
+
+
+GROUP_BATCH_SIZE = 8  # Groups whose geometries are held in memory at once by the batched stages
+GROUPS_PER_PAGE = 10
+LAYER_EXTENSIONS = ('.parquet', '.gpkg', '.shp', '.geojson')
+MANIFEST_COLUMNS = ['label', 'date', 'aoi', 'ground_truth']  # Optional: 'hydrography', 'scene_path'
+
+
+def _find_layer(folder, names):
+    for name in names:
+        for extension in LAYER_EXTENSIONS:
+            path = os.path.join(folder, name + extension)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def discover_group_sources(folder):
+    """
+    Finds observation groups in a folder with one subfolder per flood event.
+
+    Subfolders are named like the example data, '<YYYY>_<MM>_<DD>_<Label>', and contain 'aoi' and
+    'ground_truth' layers (.parquet, .gpkg, .shp or .geojson) and optionally a 'hydrography' layer.
+
+    Args:
+        folder (str): Folder to scan.
+
+    Returns:
+        list: One record per group with 'label', 'date', 'aoi', 'ground_truth' and 'hydrography'.
+    """
+    records = []
+    for name in sorted(os.listdir(folder)):
+        subfolder = os.path.join(folder, name)
+        if not os.path.isdir(subfolder):
+            continue
+
+        aoi, ground_truth = _find_layer(subfolder, ['aoi']), _find_layer(subfolder, ['ground_truth'])
+        parts = name.split('_', 3)
+        if aoi is None or ground_truth is None or len(parts) < 4:
+            continue
+
+        records.append({
+            'label': parts[3],
+            'date': datetime.strptime('_'.join(parts[:3]), '%Y_%m_%d').date(),
+            'aoi': aoi,
+            'ground_truth': ground_truth,
+            'hydrography': _find_layer(subfolder, ['hydrography', 'hydrographyA'])
+        })
+    return records
+
+
+def read_manifest(path):
+    """
+    Reads observation groups from a CSV or JSON manifest with the columns in MANIFEST_COLUMNS.
+
+    Relative layer paths are resolved against the folder of the manifest.
+
+    Args:
+        path (str): Path of the manifest.
+
+    Returns:
+        list: One record per group.
+
+    Raises:
+        ValueError: If required columns are missing.
+    """
+    manifest = pd.read_json(path) if path.lower().endswith('.json') else pd.read_csv(path)
+    missing = [column for column in MANIFEST_COLUMNS if column not in manifest.columns]
+    if missing:
+        raise ValueError(f"Manifest is missing the columns {', '.join(missing)}.")
+
+    base = os.path.dirname(os.path.abspath(path))
+    records = []
+    for row in manifest.to_dict('records'):
+        record = {'label': str(row['label']), 'date': pd.Timestamp(row['date']).date()}
+        for layer in ('aoi', 'ground_truth', 'hydrography', 'scene_path'):
+            value = row.get(layer)
+            record[layer] = os.path.join(base, value) if isinstance(value, str) and value else None
+        records.append(record)
+    return records
+
+
+def create_observation_groups(records):
+    """
+    Creates path-backed observation groups, which load their geometries on first access.
+
+    Returns:
+        ObservationGroupRegistry: The groups.
+    """
+    groups = ObservationGroupRegistry()
+    for record in records:
+        group = ObservationGroup(date=record['date'], label=record['label'],
+                                 source={layer: record.get(layer) for layer in ('aoi', 'ground_truth', 'hydrography')})
+        if record.get('scene_path'):
+            group['scene_path'] = record['scene_path']
+        groups.append(group)
+    return groups
+
+
+def import_observation_groups(path):
+    """
+    Replaces the session's observation groups with the groups of a folder (see discover_group_sources) or
+    a manifest (see read_manifest).
+
+    Args:
+        path (str): Folder or manifest path.
+
+    Returns:
+        int: Number of imported groups.
+    """
+    records = discover_group_sources(path) if os.path.isdir(path) else read_manifest(path)
+    labels = [record['label'] for record in records]
+    if len(set(labels)) != len(labels):
+        raise ValueError("Group labels must be unique.")
+
+    st.session_state.observation_groups = create_observation_groups(records)
+    invalidate_session_artifacts()
+    return len(records)
+
+
+def iter_group_batches(indexed_groups, batch_size=GROUP_BATCH_SIZE):
+    """
+    Yields groups in batches with loaded geometries and unloads path-backed groups after each batch, so at
+    most batch_size groups hold their GeoDataFrames at once.
+
+    Args:
+        indexed_groups (list): (index, group) pairs.
+        batch_size (int): Number of groups per batch.
+
+    Yields:
+        list: (index, group) pairs of the batch.
+    """
+    indexed_groups = list(indexed_groups)
+    for start in range(0, len(indexed_groups), batch_size):
+        batch = indexed_groups[start:start + batch_size]
+        for _, group in batch:
+            group.load()
+        try:
+            yield batch
+        finally:
+            for _, group in batch:
+                group.unload()
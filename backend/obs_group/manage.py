@@ -1,20 +1,23 @@
 # Standard Library Imports
 import hashlib
 import json
-from datetime import date
 
 # Third-Party Library Imports
 import streamlit as st
-import geopandas as gpd
 
 # Local/Application-Specific Imports
-# (No local/application-specific imports)
+from .model import ObservationGroup, ObservationGroupRegistry, fingerprint_observation_group
 
 
 
 def initialize_observation_groups(num_sets):
     if 'observation_groups' not in st.session_state:
-        st.session_state.observation_groups = [{} for _ in range(num_sets)]
+        st.session_state.observation_groups = ObservationGroupRegistry(ObservationGroup() for _ in range(num_sets))
+
+
+def add_observation_group():
+    st.session_state.observation_groups.append(ObservationGroup())
+    return len(st.session_state.observation_groups) - 1
 
 
 def update_observation_group(index, **kwargs):
@@ -28,68 +31,34 @@ def get_observation_group(index):
     return {}
 
 
+def get_observation_group_by_label(label):
+    return st.session_state.observation_groups.by_label(label)
+
+
+def get_observation_group_by_id(group_id):
+    return st.session_state.observation_groups.by_id(group_id)
+
+
 def get_all_observation_groups():
     return [group for group in st.session_state.observation_groups if group]
 
 
 def are_observation_groups_valid():
     all_groups = get_all_observation_groups()
-
-    if not all_groups:
-        return False
-
-    for group in all_groups:
-        if ('aoi' not in group or
-                not isinstance(group['aoi'], gpd.GeoDataFrame) or
-                'date' not in group or
-                'ground_truth' not in group or
-                not isinstance(group['ground_truth'], gpd.GeoDataFrame)):
-            return False
-
-    return True
+    return bool(all_groups) and all(group.is_valid for group in all_groups)
 
 
 def are_observation_groups_valid_and_covered():
     all_groups = get_all_observation_groups()
-
-    if not all_groups:
-        return False
-
-    for group in all_groups:
-        # Check if the group has all required attributes
-        if ('aoi' not in group or
-                not isinstance(group['aoi'], gpd.GeoDataFrame) or
-                'date' not in group or
-                'feature_image' not in group or
-                'ground_truth' not in group or
-                not isinstance(group['ground_truth'], gpd.GeoDataFrame)):
-            return False
-
-    return True
+    return bool(all_groups) and all(group.is_valid and 'feature_image' in group for group in all_groups)
 
 
 def hash_observation_groups():
-    # Extract relevant fields from the observation groups
-    relevant_data = [
-        {
-            'date': group.get('date').isoformat() if isinstance(group.get('date'), date) else group.get('date'),
-            'label': group.get('label')
-        }
-        for group in st.session_state.observation_groups
-    ]
-    # Convert to JSON string
-    observation_groups_json = json.dumps(relevant_data, sort_keys=True)
-    # Generate and return MD5 hash
-    return hashlib.md5(observation_groups_json.encode()).hexdigest()
+    # Combine the content fingerprints of all observation groups
+    fingerprints = [fingerprint_observation_group(group) if group else None
+                    for group in st.session_state.observation_groups]
+    return hashlib.sha256(json.dumps(fingerprints).encode()).hexdigest()
 
 
 def hash_single_observation_group(group):
-    # Extract relevant fields from the observation group
-    relevant_data = {
-        'date': group.get('date').isoformat() if isinstance(group.get('date'), date) else group.get('date'),
-        'label': group.get('label')
-    }
-    # Convert to JSON string
-    observation_group_json = json.dumps(relevant_data, sort_keys=True)
-    # Generate and return MD5 hash
-    return hashlib.md5(observation_group_json.encode()).hexdigest()
+    return fingerprint_observation_group(group)
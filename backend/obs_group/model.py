@@ -0,0 +1,312 @@
+# Standard Library Imports
+import hashlib
+import itertools
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date as Date
+from typing import ClassVar, Optional
+
+# Third-Party Library Imports
+import ee
+import geopandas as gpd
+from shapely.geometry import mapping
+
+# Local/Application-Specific Imports
+from backend.utils.geometry import hash_geodataframe, union_geodataframes, get_lod_gdf, read_layers
+from backend.utils.result_cache import fingerprint as fingerprint_parts
+
+
+_group_ids = itertools.count(1)
+
+
+def _fingerprint_group_content(group):
+    aoi, ground_truth = group.get('aoi'), group.get('ground_truth')
+    observation_date = group.get('date')
+    observation_date = observation_date.isoformat() if isinstance(observation_date, Date) else observation_date
+    label = group.get('label')
+
+    # The memo keeps references to the hashed objects, so a replaced GeoDataFrame never matches
+    memo = group.get('_fingerprint_memo')
+    if (memo is not None and memo[0] is aoi and memo[1] is ground_truth
+            and memo[2] == observation_date and memo[3] == label):
+        return memo[4]
+
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps({'date': observation_date, 'label': label}, sort_keys=True).encode())
+    hash_geodataframe(hasher, aoi)
+    hash_geodataframe(hasher, ground_truth)
+    group_fingerprint = hasher.hexdigest()
+    group['_fingerprint_memo'] = (aoi, ground_truth, observation_date, label, group_fingerprint)
+    return group_fingerprint
+
+
+def fingerprint_observation_group(group, features=None, sampling_params=None):
+    """
+    Computes a content fingerprint of an observation group.
+
+    The fingerprint covers the WKB and CRS of the AOI and ground truth geometries, the date and the label,
+    or the source files of path-backed groups. It is memoized on the group and only recomputed when the
+    AOI, ground truth, date or label change.
+    Optionally, a feature list and sampling parameters are mixed in.
+
+    Args:
+        group (dict): Observation group.
+        features (list, optional): Feature names the cached artifact depends on.
+        sampling_params (dict, optional): Sampling parameters the cached artifact depends on.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    if isinstance(group, ObservationGroup):
+        group_fingerprint = group.fingerprint
+    else:
+        group_fingerprint = _fingerprint_group_content(group)
+
+    if features is None and sampling_params is None:
+        return group_fingerprint
+
+    extended = json.dumps([group_fingerprint, list(features or []), sampling_params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(extended.encode()).hexdigest()
+
+
+def _is_same_value(previous, value):
+    # GeoDataFrames are compared by identity, other source fields (date, label) by equality
+    if previous is value:
+        return True
+    if isinstance(previous, gpd.GeoDataFrame) or isinstance(value, gpd.GeoDataFrame):
+        return False
+    return previous == value
+
+
+@dataclass(slots=True, eq=False)
+class ObservationGroup:
+    """
+    Observation group with typed source fields and a dictionary of derived artifacts.
+
+    Groups keep the mapping interface of the plain dictionaries they replace: group['feature_image'],
+    group.get('label'), 'X' in group and group.update(...) work for source fields and artifacts alike.
+    Derived values (fingerprint, unified ground truth, flooded area ratio, Earth Engine geometry) are
+    computed on first access and memoized until a source field is replaced.
+
+    Attributes:
+        aoi (gpd.GeoDataFrame): Area of interest.
+        ground_truth (gpd.GeoDataFrame): Flooded area.
+        date (datetime.date): Observation date.
+        label (str): Site label, unique within the registry.
+        id (int): Stable identifier of the group within the server process.
+        artifacts (dict): Everything else stored on the group, e.g. 'feature_image', 'X' and 'y'.
+        source (dict): Optional file paths of the 'aoi', 'ground_truth' and 'hydrography' layers. Groups with
+            a source load their geometries on first access and can be unloaded again, see load() and unload().
+    """
+
+    SOURCE_FIELDS: ClassVar[tuple] = ('aoi', 'ground_truth', 'date', 'label')
+    GEOMETRY_FIELDS: ClassVar[tuple] = ('aoi', 'ground_truth')
+
+    aoi: Optional[gpd.GeoDataFrame] = None
+    ground_truth: Optional[gpd.GeoDataFrame] = None
+    date: Optional[Date] = None
+    label: Optional[str] = None
+    id: int = field(default_factory=lambda: next(_group_ids))
+    artifacts: dict = field(default_factory=dict, repr=False)
+    source: Optional[dict] = None
+    _cache: dict = field(default_factory=dict, repr=False)
+
+    def __setattr__(self, name, value):
+        try:
+            previous = getattr(self, name)
+        except AttributeError:  # During __init__
+            object.__setattr__(self, name, value)
+            return
+
+        object.__setattr__(self, name, value)
+        # Replacing a source field invalidates everything derived from it, re-setting the same value does not
+        if name in ObservationGroup.SOURCE_FIELDS and not _is_same_value(previous, value):
+            self._cache.clear()
+            if name in ObservationGroup.GEOMETRY_FIELDS:
+                object.__setattr__(self, 'source', None)  # Edited geometries can no longer be reloaded
+
+    # Lazy loading
+
+    @property
+    def is_loaded(self):
+        return self.source is None or all(getattr(self, name) is not None for name in ObservationGroup.GEOMETRY_FIELDS)
+
+    def load(self):
+        """
+        Reads the geometries from the source files, merging the hydrography into the ground truth.
+        """
+        if self.is_loaded:
+            return self
+        layers = read_layers({name: path for name, path in self.source.items() if path})
+        ground_truth = layers['ground_truth']
+        if 'hydrography' in layers:
+            ground_truth = union_geodataframes(ground_truth, layers['hydrography'])
+
+        # Loading does not change the content, memoized derived fields stay valid
+        object.__setattr__(self, 'aoi', layers['aoi'])
+        object.__setattr__(self, 'ground_truth', ground_truth)
+        return self
+
+    def unload(self):
+        """
+        Releases the geometries of a path-backed group. Small derived fields (fingerprint, EE geometry, area
+        ratio) are kept, the unified ground truth is dropped.
+        """
+        if self.source is None:
+            return self
+        for name in ObservationGroup.GEOMETRY_FIELDS:
+            object.__setattr__(self, name, None)
+        self._cache.pop('unified_ground_truth', None)
+        return self
+
+    # Mapping interface
+
+    def __getitem__(self, key):
+        if key in ObservationGroup.SOURCE_FIELDS:
+            if key in ObservationGroup.GEOMETRY_FIELDS:
+                self.load()
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.artifacts[key]
+
+    def __setitem__(self, key, value):
+        if key in ObservationGroup.SOURCE_FIELDS:
+            setattr(self, key, value)
+        else:
+            self.artifacts[key] = value
+
+    def __delitem__(self, key):
+        if key in ObservationGroup.SOURCE_FIELDS:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        else:
+            del self.artifacts[key]
+
+    def __contains__(self, key):
+        if key in ObservationGroup.GEOMETRY_FIELDS and self.source is not None:
+            return True
+        if key in ObservationGroup.SOURCE_FIELDS:
+            return getattr(self, key) is not None
+        return key in self.artifacts
+
+    def __bool__(self):
+        # Empty like an empty dictionary until anything is stored
+        return (any(getattr(self, name) is not None for name in ObservationGroup.SOURCE_FIELDS)
+                or self.source is not None or bool(self.artifacts))
+
+    def keys(self):
+        return [name for name in ObservationGroup.SOURCE_FIELDS if name in self] + list(self.artifacts)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def update(self, *mappings, **kwargs):
+        for other in mappings + (kwargs,):
+            for key, value in dict(other).items():
+                self[key] = value
+
+    # Derived fields
+
+    def _memo(self, name, compute):
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    @property
+    def is_valid(self):
+        # Path-backed groups are checked when imported and not loaded for validation
+        has_geometries = self.source is not None or (isinstance(self.aoi, gpd.GeoDataFrame)
+                                                     and isinstance(self.ground_truth, gpd.GeoDataFrame))
+        return has_geometries and self.date is not None
+
+    @property
+    def fingerprint(self):
+        def compute():
+            if self.source is not None:
+                # Path-backed groups are fingerprinted by their files, without loading them
+                files = {name: (path, os.stat(path).st_size, os.stat(path).st_mtime_ns) if path else None
+                         for name, path in sorted(self.source.items())}
+                observation_date = self.date.isoformat() if isinstance(self.date, Date) else self.date
+                return fingerprint_parts(files, observation_date, self.label)
+
+            # Same content hash as for plain dictionaries, e.g. memoized by read_example_groups
+            return _fingerprint_group_content(self)
+        return self._memo('fingerprint', compute)
+
+    @property
+    def unified_ground_truth(self):
+        return self._memo('unified_ground_truth', lambda: union_geodataframes(self.load().ground_truth))
+
+    @property
+    def flooded_area_ratio(self):
+        # Flooded area over AOI area, both in the local UTM zone for geographic CRS
+        def compute():
+            aoi, flooded = self.load().aoi, self.unified_ground_truth
+            if aoi.crs is not None and aoi.crs.is_geographic:
+                aoi = aoi.to_crs(aoi.estimate_utm_crs())
+                flooded = flooded.to_crs(aoi.crs)
+            return float(flooded.area.sum() / aoi.area.sum())
+        return self._memo('flooded_area_ratio', compute)
+
+    @property
+    def ee_geometry(self):
+        # Simplified Earth Engine geometry of all AOI features, see get_lod_gdf
+        def compute():
+            aoi = self.load().aoi
+            if aoi.crs is not None and aoi.crs.to_epsg() != 4326:
+                aoi = aoi.to_crs(epsg=4326)
+            return ee.Geometry(mapping(get_lod_gdf(aoi, 'ee').geometry.union_all()))
+        return self._memo('ee_geometry', compute)
+
+
+class ObservationGroupRegistry(list):
+    """
+    List of observation groups with lookups by label and id.
+
+    The indices are rebuilt lazily when a lookup misses or hits a group whose label changed, so groups can be
+    relabeled in place.
+    """
+
+    def __init__(self, groups=()):
+        super().__init__(groups)
+        self._by_label = {}
+        self._by_id = {}
+
+    def _reindex(self):
+        self._by_label = {group.label: group for group in self if group.label is not None}
+        self._by_id = {group.id: group for group in self}
+
+    def by_label(self, label):
+        group = self._by_label.get(label)
+        if group is None or group.label != label:
+            self._reindex()
+            group = self._by_label.get(label)
+        return group
+
+    def by_id(self, group_id):
+        group = self._by_id.get(group_id)
+        if group is None:
+            self._reindex()
+            group = self._by_id.get(group_id)
+        return group
+
+    def index_of(self, group):
+        return next(i for i, candidate in enumerate(self) if candidate is group)
@@ -1,4 +1,6 @@
 from .utils import unify_ground_truth
-from .stratified_sample import get_stratified_sample
-from .compile_data import get_group_X_y
-from .logo_cv import get_logo_folds
\ No newline at end of file
+from .stratified_sample import get_stratified_sample, DEFAULT_SAMPLE_SEED
+from .compile_data import get_group_X_y, hash_sample_points
+from backend.model_selection import (get_logo_folds, FoldStore, Fold, INNER_CV_SCHEMES, SpatialCV,
+                                     SpatialBlockKFold, BufferedKFold, create_inner_cv, split_inner_cv)
+from .sample_pool import SamplePool, get_sample_pool, prune_sample_pools
@@ -1,46 +1,135 @@
+import hashlib
+
 import numpy as np
 import streamlit as st
 import ee
 import pandas as pd
 
-def convert_sampled_points_to_fc(sampled_points_df):
-    features = sampled_points_df.apply(lambda row: ee.Feature(
-        ee.Geometry.Point([row['lon'], row['lat']]),
-        {'class': 1 if row['class'] == 1 else 0}
-    ), axis=1)
-    return ee.FeatureCollection(features.tolist())
+from backend.utils.result_cache import get_result_cache, ee_fingerprint
+from backend.compute import get_compute_backend
+from backend.ee.batch import RequestBatch
+
+# Earth Engine aborts interactive requests on collections with more than 5000 elements
+MAX_POINTS_PER_REQUEST = 5000
+CHUNKS_PER_BATCH = 4
+SAMPLE_SCALE = 10
+
+
+def convert_sampled_points_to_fc(sampled_points_df, sample_ids=None):
+    """
+    Converts sampled points to an ee.FeatureCollection built server-side from one list of coordinate rows.
 
+    Args:
+        sampled_points_df (pd.DataFrame): Points with 'lon', 'lat' and 'class' columns.
+        sample_ids (np.ndarray, optional): Integer id of each point. Defaults to the row position.
 
-@st.cache_data()
-def get_group_X_y(_group, group_hash, sampled_points_df):
-    aoi_ee = _group['aoi_ee']
-    image = _group['feature_image']
-    all_features = st.session_state.all_features
+    Returns:
+        ee.FeatureCollection: Point features with 'class' and 'sample_id' properties.
+    """
+    if sample_ids is None:
+        sample_ids = np.arange(len(sampled_points_df))
 
-    features = []
-    labels = []
+    rows = np.column_stack([
+        sampled_points_df['lon'].to_numpy(dtype=float),
+        sampled_points_df['lat'].to_numpy(dtype=float),
+        (sampled_points_df['class'].to_numpy() == 1).astype(float),
+        np.asarray(sample_ids, dtype=float)
+    ]).tolist()
 
-    # Convert sampled points to ee.FeatureCollection
-    sampled_points_ee = convert_sampled_points_to_fc(sampled_points_df)
+    def row_to_feature(row):
+        row = ee.List(row)
+        return ee.Feature(ee.Geometry.Point(row.slice(0, 2)), {'class': row.get(2), 'sample_id': row.get(3)})
 
-    # Sample the image vector
-    sampled_data = image.select(all_features).sampleRegions(
+    return ee.FeatureCollection(ee.List(rows).map(row_to_feature))
+
+
+def get_sample_columns(image, sampled_points_ee, features):
+    # Sample the image and return one list per column instead of verbose GeoJSON features
+    columns = ['sample_id', 'class'] + list(features)
+    sampled = image.select(list(features)).sampleRegions(
         collection=sampled_points_ee,
-        properties=['class'],
-        scale=10
-    ).getInfo()
-
-    # Extract features and labels
-    for feature in sampled_data['features']:
-        properties = feature['properties']
-
-        if all(var in properties for var in all_features):
-            feature_vector = [properties[var] for var in all_features]
-            features.append(feature_vector)
-            labels.append(properties['class'])
-
-        # Convert features and labels to DataFrames with appropriate column names
-        X = pd.DataFrame(features, columns=all_features)  # DataFrame with feature names as column names
-        y = pd.DataFrame(labels, columns=['label'])  # DataFrame with 'label' as the column name
+        properties=['class', 'sample_id'],
+        scale=SAMPLE_SCALE
+    )
+    return sampled.reduceColumns(ee.Reducer.toList().repeat(len(columns)), columns).get('list')
+
+
+def fetch_sample_columns(image, sampled_points_df, features, sample_ids=None):
+    """
+    Samples an image at the given points and returns the values as arrays.
+
+    The points are split into chunks below the interactive element limit, and chunks are fetched in pages
+    of CHUNKS_PER_BATCH chunks per round trip. Points on masked pixels are dropped, as by sampleRegions.
+
+    Args:
+        image (ee.Image): Feature image.
+        sampled_points_df (pd.DataFrame): Points with 'lon', 'lat' and 'class' columns.
+        features (list): List of feature band names.
+        sample_ids (np.ndarray, optional): Integer id of each point. Defaults to the row position.
+
+    Returns:
+        tuple: Sorted sample ids (int64), X (float32, one column per feature) and labels (int8).
+    """
+    if sample_ids is None:
+        sample_ids = np.arange(len(sampled_points_df))
+    sample_ids = np.asarray(sample_ids)
+
+    chunk_starts = range(0, len(sampled_points_df), MAX_POINTS_PER_REQUEST)
+    columns = []
+
+    for page_start in range(0, len(chunk_starts), CHUNKS_PER_BATCH):
+        batch = RequestBatch()
+        for start in chunk_starts[page_start:page_start + CHUNKS_PER_BATCH]:
+            stop = start + MAX_POINTS_PER_REQUEST
+            sampled_points_ee = convert_sampled_points_to_fc(sampled_points_df.iloc[start:stop], sample_ids[start:stop])
+            batch.add(start, get_sample_columns(image, sampled_points_ee, features))
+
+        for start, chunk_columns in sorted(batch.resolve().items()):
+            columns.append(np.asarray(chunk_columns, dtype=float).reshape(len(features) + 2, -1))
+
+    if columns:
+        table = np.concatenate(columns, axis=1)
+    else:
+        table = np.empty((len(features) + 2, 0))
+
+    order = np.argsort(table[0], kind='stable')
+    ids = table[0, order].astype(np.int64)
+    labels = table[1, order].astype(np.int8)
+    X = np.ascontiguousarray(table[2:, order].T, dtype=np.float32)
+
+    return ids, X, labels
+
+
+def hash_sample_points(sampled_points_df):
+    return hashlib.sha256(pd.util.hash_pandas_object(sampled_points_df, index=False).values.tobytes()).hexdigest()
+
+
+@st.cache_data(show_spinner=False)
+def get_group_X_y(_group, feature_image_fingerprint, sampled_points_df, use_disk_cache=False, features=None,
+                  backend_name=None):
+    # Pass features and backend_name explicitly when calling from outside the script thread. The cache is keyed
+    # on the feature image fingerprint, which changes with the backend and scene, not only with the group
+    all_features = list(features) if features is not None else st.session_state.all_features
+    backend = get_compute_backend(backend_name)
+
+    if backend.name != 'ee':
+        return backend.sample_points(_group, _group['feature_image'], sampled_points_df, all_features)
+
+    if use_disk_cache:
+        cache_key = ee_fingerprint(_group['feature_image'].select(all_features), feature_image_fingerprint,
+                                   hash_sample_points(sampled_points_df))
+        return get_result_cache().get_or_compute(
+            cache_key, lambda: extract_group_X_y(_group, sampled_points_df, all_features))
+
+    return extract_group_X_y(_group, sampled_points_df, all_features)
+
+
+def extract_group_X_y(group, sampled_points_df, all_features):
+    # Columnar extraction, X and y are built once from the fetched arrays and indexed by sample id
+    sample_ids = sampled_points_df['sample_id'].to_numpy() if 'sample_id' in sampled_points_df else None
+    ids, X, labels = fetch_sample_columns(group['feature_image'], sampled_points_df, all_features, sample_ids)
+
+    X = pd.DataFrame(X, columns=all_features, index=ids)  # DataFrame with feature names as column names
+    y = pd.DataFrame({'label': labels.astype(int)}, index=ids)  # DataFrame with 'label' as the column name
 
     return X, y
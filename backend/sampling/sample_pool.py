@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from backend.sampling.stratified_sample import get_class_strata, draw_points, draw_unique_pixels
+
+CLASS_LABELS = (1, 0)  # Flooded first, as in get_stratified_sample
+
+
+class SamplePool:
+    """
+    Append-only sample of one group for one seed and pixel grid, with the features extracted so far.
+
+    Points are drawn per class from one random stream and never replaced. A sample of a given size is the
+    first points of each class, so growing the sample only draws and extracts the missing points, and
+    changing the class allocation mostly selects from points that were extracted before.
+    """
+
+    def __init__(self, seed, grid=None):
+        self.rng = np.random.default_rng(seed)
+        self.grid = grid
+        self.seen = np.empty(0, dtype=np.int64)  # Pixel keys drawn so far, see draw_unique_pixels
+        empty = pd.DataFrame({'lon': np.empty(0), 'lat': np.empty(0), 'class': np.empty(0, dtype=int),
+                              'sample_id': np.empty(0, dtype=np.int64)})
+        self.points = {label: empty for label in CLASS_LABELS}
+        self.extracted_ids = set()
+        self.X = None
+        self.y = None
+
+    @property
+    def size(self):
+        return sum(len(points) for points in self.points.values())
+
+    def draw(self, aoi, ground_truth, sizes):
+        """
+        Draws the points missing for the requested class sizes.
+
+        Args:
+            aoi (gpd.GeoDataFrame): Area of interest.
+            ground_truth (gpd.GeoDataFrame): Flooded area.
+            sizes (dict): Requested number of points per class label.
+        """
+        strata = get_class_strata(aoi, ground_truth)
+        for label in CLASS_LABELS:
+            missing = sizes.get(label, 0) - len(self.points[label])
+            if missing <= 0:
+                continue
+
+            if self.grid is None:
+                coordinates = draw_points(strata[label], missing, self.rng)
+            else:
+                coordinates, self.seen = draw_unique_pixels(strata[label], missing, self.rng, self.grid, aoi.crs,
+                                                            self.seen)
+            new_points = pd.DataFrame({'lon': coordinates[:, 0], 'lat': coordinates[:, 1], 'class': label,
+                                       'sample_id': np.arange(self.size, self.size + len(coordinates))})
+            self.points[label] = pd.concat([self.points[label], new_points], ignore_index=True)
+
+    def pending_points(self):
+        # Points whose features were not extracted yet, e.g. the ones added by the last draw
+        points = pd.concat(self.points.values(), ignore_index=True)
+        return points[~points['sample_id'].isin(self.extracted_ids)].reset_index(drop=True)
+
+    def add_extracted(self, points, X, y):
+        """
+        Adds extracted features. X and y are indexed by sample id. Points missing from X (masked pixels) are
+        marked as extracted as well, so they are not requested again.
+        """
+        self.extracted_ids.update(points['sample_id'].tolist())
+        self.X = X if self.X is None else pd.concat([self.X, X])
+        self.y = y if self.y is None else pd.concat([self.y, y])
+
+    def select(self, sizes):
+        """
+        Returns the sample of the requested class sizes from the pool.
+
+        Returns:
+            tuple: Sample coordinates ('lon', 'lat', 'class'), X and y with a fresh index, flooded rows first.
+                Points without features (masked pixels) are left out, so the rows of all three align.
+        """
+        points = pd.concat([self.points[label].iloc[:sizes.get(label, 0)] for label in CLASS_LABELS],
+                           ignore_index=True)
+        if self.X is None:
+            return points[['lon', 'lat', 'class']].iloc[:0], pd.DataFrame(), pd.DataFrame({'label': []})
+
+        points = points[points['sample_id'].isin(self.X.index)].reset_index(drop=True)
+        ids = points['sample_id'].to_numpy()
+        return (points[['lon', 'lat', 'class']], self.X.loc[ids].reset_index(drop=True),
+                self.y.loc[ids].reset_index(drop=True))
+
+
+def get_sample_pools():
+    if 'sample_pools' not in st.session_state:
+        st.session_state.sample_pools = {}
+    return st.session_state.sample_pools
+
+
+def get_sample_pool(feature_image_fingerprint, seed, grid=None):
+    """
+    Returns the sample pool of a group for a seed and pixel grid, creating it if needed.
+
+    Pools are keyed by the fingerprint of the feature image artifact, which covers the group geometries, the
+    feature list and the compute backend, so a pool is never reused for other features or another scene.
+    """
+    pools = get_sample_pools()
+    key = (feature_image_fingerprint, seed, grid)
+    if key not in pools:
+        pools[key] = SamplePool(seed, grid)
+    return pools[key]
+
+
+def prune_sample_pools(feature_image_fingerprints):
+    # Forget pools of feature images that were rebuilt, e.g. after an AOI or the feature list changed
+    pools = get_sample_pools()
+    for key in [key for key in pools if key[0] not in feature_image_fingerprints]:
+        del pools[key]
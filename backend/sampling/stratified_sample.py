@@ -1,15 +1,221 @@
+import numpy as np
 import pandas as pd
+import shapely
+import streamlit as st
+from pyproj import CRS, Transformer
 
-def sample_points_in_polygon(poly, n, label):
-    sample_gs = poly.sample_points(n).explode()
-    sample_df = sample_gs.get_coordinates(ignore_index=True)
-    sample_df['class'] = label
-    sample_df.columns = ['lon', 'lat', 'class']
-    return sample_df
-
-def get_stratified_sample(aoi, ground_truth, flooded_size, non_flooded_size):
-    flooded_poly = ground_truth.geometry
-    non_flooded_poly = aoi.geometry.iloc[0].difference(flooded_poly)
-    flooded_sample = sample_points_in_polygon(flooded_poly, flooded_size, 1)
-    non_flooded_sample = sample_points_in_polygon(non_flooded_poly, non_flooded_size, 0)
-    return pd.concat([flooded_sample, non_flooded_sample])
+from backend.utils.geometry import fingerprint_geodataframes
+
+DEFAULT_SAMPLE_SEED = 42
+OVERSAMPLING = 1.5  # Candidates drawn per missing point when topping up a snapped sample
+MAX_TOP_UP_ROUNDS = 8
+
+
+def _triangle_vertices(triangles):
+    # Closed rings of four coordinates, the last one repeats the first
+    return shapely.get_coordinates(triangles).reshape(-1, 4, 2)[:, :3]
+
+
+def _convex_parts(polygons):
+    # Cuts polygons along horizontal lines through their vertices. No vertex lies strictly inside a slab, so
+    # every part is a trapezoid or a triangle.
+    parts = []
+    for polygon in polygons:
+        ys = np.unique(shapely.get_coordinates(polygon)[:, 1])
+        x_min, _, x_max, _ = shapely.bounds(polygon)
+        slabs = shapely.box(x_min, ys[:-1], x_max, ys[1:])
+        parts.append(shapely.get_parts(shapely.intersection(polygon, slabs)))
+    if not parts:
+        return np.empty(0, dtype=object)
+    parts = shapely.get_parts(np.concatenate(parts))
+    return parts[(shapely.get_type_id(parts) == 3) & (shapely.area(parts) > 0)]
+
+
+def _fan_triangles(polygons):
+    # Convex polygons as fans of triangles around their first vertex
+    vertices = []
+    for ring in shapely.get_exterior_ring(polygons):
+        coordinates = shapely.get_coordinates(ring)[:-1]
+        vertices.extend(coordinates[[0, i, i + 1]] for i in range(1, len(coordinates) - 1))
+    return np.array(vertices, dtype=float).reshape(-1, 3, 2)
+
+
+def _clipped_delaunay_triangles(polygons):
+    """
+    Triangulates polygons with the unconstrained Delaunay triangulation of their vertices, for shapely
+    versions without constrained_delaunay_triangles (< 2.1). Triangles inside their polygon are kept as they
+    are. The few that cross the boundary are clipped to the polygon, cut into convex parts and fanned out, so
+    the triangles still cover the polygons exactly.
+    """
+    shapely.prepare(polygons)
+    triangles, index = shapely.get_parts(shapely.delaunay_triangles(polygons), return_index=True)
+    inside = shapely.within(triangles, polygons[index])
+    clipped = shapely.get_parts(shapely.intersection(triangles[~inside], polygons[index[~inside]]))
+    clipped = clipped[shapely.get_type_id(clipped) == 3]
+    return np.concatenate([_triangle_vertices(triangles[inside]), _fan_triangles(_convex_parts(clipped))])
+
+
+def triangulate_polygons(geometries):
+    """
+    Splits polygons into triangles that cover them exactly, respecting holes and concave boundaries. Uses the
+    constrained Delaunay triangulation where shapely has it and clipped Delaunay triangles otherwise.
+
+    Parameters:
+    geometries (np.ndarray): Array of shapely geometries. Non-polygonal parts are ignored.
+
+    Returns:
+    tuple: Triangle vertices of shape (T, 3, 2) and the sampling probability of each triangle (area share).
+    """
+    parts = shapely.get_parts(shapely.get_parts(shapely.make_valid(np.asarray(geometries, dtype=object))))
+    polygons = parts[shapely.get_type_id(parts) == 3]
+    if hasattr(shapely, 'constrained_delaunay_triangles'):
+        triangles = shapely.get_parts(shapely.constrained_delaunay_triangles(polygons))
+        vertices = _triangle_vertices(triangles[shapely.get_type_id(triangles) == 3])
+    else:
+        vertices = _clipped_delaunay_triangles(polygons)
+
+    edges_1, edges_2 = vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0]
+    areas = 0.5 * np.abs(edges_1[:, 0] * edges_2[:, 1] - edges_1[:, 1] * edges_2[:, 0])
+    if areas.sum() == 0:
+        return np.empty((0, 3, 2)), np.empty(0)
+    return vertices, areas / areas.sum()
+
+
+def sample_points_in_triangles(vertices, weights, n, rng):
+    # Pick triangles by area, then a uniform point per triangle, folding the unit square onto the triangle
+    if n == 0 or len(vertices) == 0:
+        return np.empty((0, 2))
+    picked = vertices[rng.choice(len(vertices), size=n, p=weights)]
+    r = rng.random((n, 2))
+    outside = r.sum(axis=1) > 1
+    r[outside] = 1 - r[outside]
+    return picked[:, 0] + r[:, :1] * (picked[:, 1] - picked[:, 0]) + r[:, 1:] * (picked[:, 2] - picked[:, 0])
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _get_class_strata(_aoi, _ground_truth, fingerprint):
+    # Flooded area and its complement within the AOI, prepared and triangulated once per group geometry
+    flooded = shapely.union_all(_ground_truth.geometry.values)
+    non_flooded = shapely.difference(shapely.union_all(_aoi.geometry.values), flooded)
+
+    strata = {}
+    for label, geometry in ((1, flooded), (0, non_flooded)):
+        shapely.prepare(geometry)
+        strata[label] = (geometry, *triangulate_polygons([geometry]))
+    return strata
+
+
+def get_class_strata(aoi, ground_truth):
+    """
+    Returns the flooded (1) and non-flooded (0) areas of a group with their triangulations, memoized per
+    process by the geometry fingerprint.
+
+    Returns:
+    dict: Class labels as keys, (geometry, triangle vertices, triangle weights) as values.
+    """
+    return _get_class_strata(aoi, ground_truth, fingerprint_geodataframes(aoi, ground_truth))
+
+
+def draw_points(stratum, n, rng):
+    _, vertices, weights = stratum
+    return sample_points_in_triangles(vertices, weights, n, rng)
+
+
+def snap_to_pixel_grid(points, grid, crs):
+    """
+    Moves points to the centers of the pixels they fall in.
+
+    Parameters:
+    points (np.ndarray): Coordinates of shape (N, 2) in the CRS of the sample.
+    grid (tuple): Affine transform (a, b, c, d, e, f) as in rasterio and the CRS of the pixel grid.
+    crs: CRS of the points. Unknown CRS are treated as the grid CRS.
+
+    Returns:
+    tuple: Pixel keys (int64, row and column packed into one integer) and the pixel centers in the CRS of
+        the points.
+    """
+    (a, _, c, _, e, f), grid_crs = grid
+    to_grid = None
+    if crs is not None and not CRS.from_user_input(crs).equals(CRS.from_user_input(grid_crs)):
+        to_grid = Transformer.from_crs(crs, grid_crs, always_xy=True)
+
+    x, y = points[:, 0], points[:, 1]
+    if to_grid is not None:
+        x, y = to_grid.transform(x, y)
+
+    cols = np.floor((x - c) / a).astype(np.int64)
+    rows = np.floor((y - f) / e).astype(np.int64)
+    center_x, center_y = c + a * (cols + 0.5), f + e * (rows + 0.5)
+    if to_grid is not None:
+        center_x, center_y = to_grid.transform(center_x, center_y, direction='INVERSE')
+
+    keys = (rows << 32) ^ (cols & 0xFFFFFFFF)
+    return keys, np.column_stack([center_x, center_y])
+
+
+def draw_unique_pixels(stratum, n, rng, grid, crs, seen):
+    """
+    Draws up to n distinct pixel centers inside a stratum, topping up until the size is reached or the
+    stratum runs out of pixels. Pixels whose center lies outside the stratum are rejected, so the label of a
+    sample is the label of the pixel it reads.
+
+    Returns:
+    tuple: Pixel centers of shape (<= n, 2) and the updated array of drawn pixel keys.
+    """
+    geometry = stratum[0]
+    centers = np.empty((0, 2))
+
+    for _ in range(MAX_TOP_UP_ROUNDS):
+        missing = n - len(centers)
+        if missing <= 0:
+            break
+
+        keys, candidates = snap_to_pixel_grid(draw_points(stratum, int(missing * OVERSAMPLING) + 1, rng), grid, crs)
+        inside = shapely.contains_xy(geometry, candidates[:, 0], candidates[:, 1])
+        keys, candidates = keys[inside], candidates[inside]
+
+        # First occurrence of each pixel that was not drawn before, in drawing order
+        _, first = np.unique(keys, return_index=True)
+        first = np.sort(first)
+        first = first[~np.isin(keys[first], seen)][:missing]
+
+        centers = np.concatenate([centers, candidates[first]])
+        seen = np.concatenate([seen, keys[first]])
+
+    return centers, seen
+
+
+def get_stratified_sample(aoi, ground_truth, flooded_size, non_flooded_size, seed=DEFAULT_SAMPLE_SEED, grid=None):
+    """
+    Draws a stratified random sample of flooded and non-flooded points in the AOI.
+
+    Points are drawn uniformly from the triangulated classes in one vectorized pass, so the run time does not
+    depend on the shape of the polygons.
+
+    With a pixel grid, points are snapped to the centers of the pixels they are extracted from and every
+    pixel is drawn at most once, so no two rows of the sample carry the same feature values. Classes with
+    fewer pixels than requested yield fewer points.
+
+    Parameters:
+    aoi (gpd.GeoDataFrame): Area of interest.
+    ground_truth (gpd.GeoDataFrame): Flooded area.
+    flooded_size (int): Number of flooded points.
+    non_flooded_size (int): Number of non-flooded points.
+    seed (int, optional): Seed of the random generator, the same seed gives the same sample.
+    grid (tuple, optional): Pixel grid as returned by ComputeBackend.sampling_grid.
+
+    Returns:
+    pd.DataFrame: Points with 'lon', 'lat' and 'class' columns, flooded points first.
+    """
+    rng = np.random.default_rng(seed)
+    strata = get_class_strata(aoi, ground_truth)
+    seen = np.empty(0, dtype=np.int64)
+
+    samples = []
+    for label, size in ((1, flooded_size), (0, non_flooded_size)):
+        if grid is None:
+            points = draw_points(strata[label], size, rng)
+        else:
+            points, seen = draw_unique_pixels(strata[label], size, rng, grid, aoi.crs, seen)
+        samples.append(pd.DataFrame({'lon': points[:, 0], 'lat': points[:, 1], 'class': label}))
+    return pd.concat(samples, ignore_index=True)
@@ -1,5 +1,4 @@
-from shapely import unary_union
-import geopandas as gpd
+from backend.utils.geometry import union_geodataframes
 
 
 def unify_ground_truth(group):
@@ -7,14 +6,12 @@ def unify_ground_truth(group):
     Performs a unary union on the geometries of the given GeoDataFrame group and
     returns a new GeoDataFrame containing the resulting multipolygon.
 
+    The union is memoized by the ground truth geometries, so repeated sampling runs reuse it.
+
     Parameters:
     group (gpd.GeoDataFrame): GeoDataFrame containing geometries to be unified.
 
     Returns:
     gpd.GeoDataFrame: A new GeoDataFrame with a single multipolygon.
     """
-    ground_truth = group['ground_truth']
-    multipolygon = unary_union(ground_truth.geometry)
-    ground_truth = gpd.GeoDataFrame(geometry=[multipolygon])
-
-    return ground_truth
\ No newline at end of file
+    return union_geodataframes(group['ground_truth'])
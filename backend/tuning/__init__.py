@@ -1,3 +1,5 @@
-from .objective import inner_cv_objective, outer_cv_objective
+from backend.model_selection import score_inner_cv, score_outer_cv
+from .objective import inner_cv_objective, outer_cv_objective, suggest_params
 from .evaluation import evaluate_model
-from .training import train_model
\ No newline at end of file
+from .training import train_model
+from .parallel import optimize_parallel, create_parallel_sampler
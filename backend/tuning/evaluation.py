@@ -14,19 +14,19 @@ def evaluate_model(folds, best_params):
     all_y_true, all_y_pred_best, all_y_pred_default = [], [], []
 
     for fold_idx, fold in enumerate(folds):
-        X_train, y_train = fold['X_train'], fold['y_train']
-        X_test, y_test = fold['X_test'], fold['y_test']
+        X_train, y_train = fold.X_train(), fold.y_train()
+        X_test, y_test = fold.X_test(), fold.y_test()
 
         # Train the model on the full training set of each fold with the best hyperparameters
         y_pred_best = train_model(X_train, y_train, X_test, best_params)
 
         # Train the model on the full training set of each fold with the default hyperparameters
         rf_default = RandomForestClassifier(random_state=42)  # Default parameters
-        rf_default.fit(X_train, y_train.values.ravel())
+        rf_default.fit(X_train, y_train)
         y_pred_default = rf_default.predict(X_test)
 
         # Store the true and predicted labels for the test set
-        all_y_true.extend(y_test.values.ravel())
+        all_y_true.extend(y_test)
         all_y_pred_best.extend(y_pred_best)
         all_y_pred_default.extend(y_pred_default)
 
@@ -0,0 +1,76 @@
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import optuna
+
+from backend.model_selection.worker import share_fold_store, init_worker, score_trial
+from .objective import suggest_params
+
+logger = logging.getLogger(__name__)
+
+
+def create_parallel_sampler(seed=42):
+    # The constant liar treats running trials as bad results, so concurrently asked trials spread out
+    return optuna.samplers.TPESampler(constant_liar=True, seed=seed)
+
+
+def optimize_parallel(study, folds, cv_type, features, param_ranges, inner_cv, n_trials, n_jobs, callbacks=()):
+    """
+    Runs the trials of a study in a pool of worker processes with Optuna's ask-and-tell interface.
+
+    The fold store is shared with the workers through memory-mapped files. The pool is kept full: a new
+    trial is asked as soon as one finishes, so the sampler sees every result that is available. Workers are
+    spawned rather than forked, since the Streamlit server process runs threads (e.g. the EE client pool).
+
+    A trial whose worker raises is told as failed, with the exception in its 'error' user attribute. If a
+    worker dies, the remaining trials fail and no new ones are asked.
+
+    Args:
+        study (optuna.Study): Study, preferably created with create_parallel_sampler.
+        folds (FoldStore): LOGO folds.
+        cv_type (str): "Inner Cross-Validation" or "Outer Cross-Validation".
+        features (list): Input features.
+        param_ranges (dict): Search space, see suggest_params.
+        inner_cv: Inner cross-validator.
+        n_trials (int): Number of trials.
+        n_jobs (int): Number of worker processes.
+        callbacks (list): Functions called with the study and each finished trial, as in study.optimize.
+    """
+    with tempfile.TemporaryDirectory(prefix='rfm-folds-') as directory:
+        shared_store = share_fold_store(folds, directory)
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=init_worker, initargs=(shared_store,)) as pool:
+            running = {}
+            asked = 0
+            broken = False
+
+            def ask():
+                nonlocal asked
+                trial = study.ask()
+                params = suggest_params(trial, param_ranges)
+                running[pool.submit(score_trial, params, cv_type, features, inner_cv)] = trial
+                asked += 1
+
+            while asked < min(n_jobs, n_trials):
+                ask()
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial = running.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        logger.error("Trial %d failed", trial.number, exc_info=e)
+                        trial.set_user_attr('error', repr(e))
+                        frozen_trial = study.tell(trial, state=optuna.trial.TrialState.FAIL)
+                        broken = broken or isinstance(e, BrokenProcessPool)
+                    else:
+                        frozen_trial = study.tell(trial, value)
+                    for callback in callbacks:
+                        callback(study, frozen_trial)
+                    if asked < n_trials and not broken:
+                        ask()
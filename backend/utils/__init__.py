@@ -1 +1,3 @@
-from .init_session_state import initialize_session_state
\ No newline at end of file
+from .init_session_state import initialize_session_state
+from .result_cache import ResultCache, get_result_cache, fingerprint, ee_fingerprint
+from .geometry import clustered_union, union_geodataframes, fingerprint_geodataframes, get_lod_gdf, LOD_PROFILES
@@ -0,0 +1,221 @@
+# Standard Library Imports
+import hashlib
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-Party Library Imports
+import numpy as np
+import geopandas as gpd
+import shapely
+import streamlit as st
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+# Local/Application-Specific Imports
+# (No local/application-specific imports)
+
+
+def read_layer(path):
+    if path.lower().endswith('.parquet'):
+        return gpd.read_parquet(path)
+    # pyogrio's Arrow path parses the whole layer in native code
+    return gpd.read_file(path, engine='pyogrio', use_arrow=True)
+
+
+def read_layers(paths):
+    """
+    Reads vector layers concurrently.
+
+    Args:
+        paths (dict): Keys and file paths of the layers.
+
+    Returns:
+        dict: The same keys and the loaded GeoDataFrames as values.
+    """
+    with ThreadPoolExecutor(max_workers=min(len(paths), 8) or 1) as executor:
+        return dict(zip(paths, executor.map(read_layer, paths.values())))
+
+
+def hash_geodataframe(hasher, gdf):
+    # WKB of every geometry plus the CRS, so any change of the geometries changes the hash
+    if not isinstance(gdf, gpd.GeoDataFrame):
+        hasher.update(b'\x00')
+        return
+    hasher.update(str(gdf.crs).encode())
+    for wkb in shapely.to_wkb(gdf.geometry.values, hex=False):
+        hasher.update(wkb or b'')
+        hasher.update(b'\x1f')
+
+
+def fingerprint_geodataframes(*gdfs):
+    """
+    Computes a content fingerprint of one or more GeoDataFrames from their geometries and CRS.
+    """
+    hasher = hashlib.sha256()
+    for gdf in gdfs:
+        hash_geodataframe(hasher, gdf)
+    return hasher.hexdigest()
+
+
+def get_intersecting_clusters(geometries):
+    """
+    Groups geometries into clusters of transitively intersecting (or touching) geometries.
+
+    Args:
+        geometries (np.ndarray): Array of shapely geometries.
+
+    Returns:
+        tuple: Number of clusters and the cluster label of every geometry.
+    """
+    tree = shapely.STRtree(geometries)
+    left, right = tree.query(geometries, predicate='intersects')
+    adjacency = coo_matrix((np.ones(len(left), dtype=bool), (left, right)), shape=(len(geometries),) * 2)
+    return connected_components(adjacency, directed=False)
+
+
+def _union_cluster(geometries):
+    if len(geometries) == 1:
+        return geometries[0]
+    # Non-overlapping polygons sharing edges (a coverage) are merged much faster by the coverage union
+    if hasattr(shapely, 'coverage_is_valid') and shapely.coverage_is_valid(geometries):
+        return shapely.coverage_union_all(geometries)
+    return shapely.union_all(geometries)
+
+
+def clustered_union(geometries):
+    """
+    Unions geometries like unary_union, but only within clusters of intersecting geometries.
+
+    An STRtree finds the intersecting pairs, each connected cluster is unioned on its own and disjoint clusters
+    are only collected into the result. This avoids the cascaded union of geometries that never touch.
+
+    Args:
+        geometries (array-like): Shapely geometries.
+
+    Returns:
+        shapely.Geometry: The union, a (Multi)Polygon for polygonal inputs.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    geometries = geometries[~(shapely.is_missing(geometries) | shapely.is_empty(geometries))]
+    if len(geometries) == 0:
+        return shapely.Polygon()
+
+    geometries = shapely.make_valid(geometries)
+    n_clusters, labels = get_intersecting_clusters(geometries)
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    unions = [_union_cluster(cluster) for cluster in np.split(geometries[order], bounds)]
+
+    parts = shapely.get_parts(unions)
+    if set(shapely.get_type_id(parts).tolist()) == {shapely.GeometryType.POLYGON}:
+        return parts[0] if len(parts) == 1 else shapely.multipolygons(parts)
+    # Mixed geometry types, fall back to a regular union of the (few) cluster results
+    return shapely.union_all(unions)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _get_union_gdf(_gdfs, fingerprint):
+    gdfs = [gdf if gdf.crs == _gdfs[0].crs else gdf.to_crs(_gdfs[0].crs) for gdf in _gdfs]
+    geometries = np.concatenate([gdf.geometry.values for gdf in gdfs])
+    return gpd.GeoDataFrame(geometry=[clustered_union(geometries)], crs=gdfs[0].crs)
+
+
+def union_geodataframes(*gdfs):
+    """
+    Unions all geometries of the GeoDataFrames into a single-row GeoDataFrame in the CRS of the first one.
+
+    The result is memoized by the content fingerprint of the inputs for the lifetime of the server process,
+    so repeated reruns and sampling runs reuse it. It is shared and must not be modified in place.
+
+    Returns:
+        gpd.GeoDataFrame: GeoDataFrame with one (Multi)Polygon.
+    """
+    return _get_union_gdf(gdfs, fingerprint_geodataframes(*gdfs))
+
+
+METERS_PER_DEGREE = 111319.49
+
+# Level-of-detail variants: simplification tolerance (tied to the 10-30 m analysis scale), the largest tolerance
+# it may be raised to for the vertex budget, and the budget
+LOD_PROFILES = {
+    'render': {'tolerance_m': 30, 'max_tolerance_m': 120, 'max_vertices': 20_000},  # Cartopy maps
+    # Earth Engine request payload, from half a 10 m pixel up to one pixel of boundary displacement
+    'ee': {'tolerance_m': 5, 'max_tolerance_m': 10, 'max_vertices': 5_000},
+    'exact': {'tolerance_m': 0, 'max_tolerance_m': 0, 'max_vertices': None},  # Sampling, only repaired
+}
+MAX_SIMPLIFY_ITERATIONS = 8
+
+
+def meters_to_crs_units(meters, crs):
+    # Degrees along a meridian for geographic (or unknown) CRS, which is conservative in longitude
+    if crs is None or crs.is_geographic:
+        return meters / METERS_PER_DEGREE
+    return meters
+
+
+def simplify_to_budget(geometries, tolerance, max_vertices=None, max_tolerance=None):
+    """
+    Simplifies geometries with a topology-preserving Douglas-Peucker, so polygons stay valid and parts of
+    MultiPolygons neither collapse nor cross. The tolerance is doubled, up to max_tolerance, until the total
+    vertex count fits the budget. Geometries that still exceed the budget are returned with a warning rather
+    than simplified beyond the analysis scale.
+
+    Args:
+        geometries (np.ndarray): Array of shapely geometries.
+        tolerance (float): Initial tolerance in CRS units. 0 disables simplification.
+        max_vertices (int, optional): Vertex budget over all geometries.
+        max_tolerance (float, optional): Largest tolerance in CRS units.
+
+    Returns:
+        np.ndarray: The simplified geometries.
+    """
+    if tolerance <= 0:
+        return geometries
+
+    simplified = shapely.simplify(geometries, tolerance, preserve_topology=True)
+    for _ in range(MAX_SIMPLIFY_ITERATIONS):
+        if max_vertices is None or shapely.get_num_coordinates(simplified).sum() <= max_vertices:
+            return simplified
+        if max_tolerance is not None and tolerance >= max_tolerance:
+            break
+        tolerance = tolerance * 2 if max_tolerance is None else min(tolerance * 2, max_tolerance)
+        simplified = shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+    num_vertices = shapely.get_num_coordinates(simplified).sum()
+    if num_vertices > max_vertices:
+        warnings.warn(f"Geometries keep {num_vertices} vertices at a simplification tolerance of {tolerance:g}, "
+                      f"more than the budget of {max_vertices}.", stacklevel=2)
+    return simplified
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def _get_lod_gdf(_gdf, fingerprint, purpose):
+    profile = LOD_PROFILES[purpose]
+    geometries = shapely.make_valid(_gdf.geometry.values)
+    tolerance = meters_to_crs_units(profile['tolerance_m'], _gdf.crs)
+    max_tolerance = meters_to_crs_units(profile['max_tolerance_m'], _gdf.crs)
+
+    lod_gdf = _gdf.copy()
+    lod_gdf.geometry = gpd.GeoSeries(simplify_to_budget(geometries, tolerance, profile['max_vertices'],
+                                                        max_tolerance),
+                                     index=_gdf.index, crs=_gdf.crs)
+    return lod_gdf
+
+
+def get_lod_gdf(gdf, purpose):
+    """
+    Returns the level-of-detail variant of a GeoDataFrame for a use, see LOD_PROFILES.
+
+    Variants are memoized per process by the geometry fingerprint and purpose. They are shared and must not
+    be modified in place.
+
+    Args:
+        gdf (gpd.GeoDataFrame): Full-resolution geometries.
+        purpose (str): 'render', 'ee' or 'exact'.
+
+    Returns:
+        gpd.GeoDataFrame: The variant, with the same rows, attributes and CRS.
+    """
+    if purpose not in LOD_PROFILES:
+        raise ValueError(f"Unknown level of detail '{purpose}', expected one of {list(LOD_PROFILES)}.")
+    return _get_lod_gdf(gdf, fingerprint_geodataframes(gdf), purpose)
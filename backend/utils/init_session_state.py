@@ -10,6 +10,9 @@ def initialize_session_state():
         st.session_state.all_features = ['VV', 'VH', 'angle', 'VV2_VH2', 'VV2_plus_VH2', 'VV_plus_VH', 'DEM', 'slope',
                                          'aspect']
 
+    if 'use_disk_cache' not in st.session_state:
+        st.session_state.use_disk_cache = True
+
     # Add more session state initializations as needed
     # if 'another_variable' not in st.session_state:
     #     st.session_state.another_variable = default_value
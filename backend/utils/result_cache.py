@@ -0,0 +1,173 @@
+# Standard Library Imports
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# Third-Party Library Imports
+import streamlit as st
+
+# Local/Application-Specific Imports
+# (No local/application-specific imports)
+
+
+DEFAULT_CACHE_DIR = os.environ.get('RFMAPP_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'rfmapp'))
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2  # 512 MB
+DEFAULT_TTL = None  # Entries never expire by default
+
+MISSING = object()
+
+
+def fingerprint(*parts):
+    """
+    Creates a stable fingerprint from JSON-serializable parts.
+
+    Args:
+        *parts: Values to include in the fingerprint. Non-JSON values are converted with str().
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def ee_fingerprint(computed_object, *parts):
+    """
+    Creates a stable fingerprint of an Earth Engine expression and additional parts.
+
+    Args:
+        computed_object (ee.ComputedObject): The Earth Engine expression.
+        *parts: Additional values, e.g. the observation group fingerprint.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    return fingerprint(computed_object.serialize(), *parts)
+
+
+class ResultCache:
+    """
+    SQLite-backed persistent result cache with size-bounded LRU eviction and an optional TTL.
+
+    Values are pickled. The cache is safe to share between threads of the Streamlit server process.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        """
+        Args:
+            path (str): Path of the SQLite database file.
+            max_bytes (int): Maximum total size of the stored values before the least recently used are evicted.
+            ttl (float, optional): Time to live of an entry in seconds. None disables expiry.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+            'created REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    def __contains__(self, key):
+        return self.get(key, MISSING, count=False) is not MISSING
+
+    def get(self, key, default=None, count=True):
+        """
+        Returns the cached value for key, or default if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, created FROM entries WHERE key = ?', (key,)).fetchone()
+
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                row = None
+
+            if row is None:
+                if count:
+                    self.misses += 1
+                return default
+
+            self._conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+            if count:
+                self.hits += 1
+
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        """
+        Stores value under key and evicts the least recently used entries above max_bytes.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(blob), len(blob), now, now)
+            )
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, computing and storing it on a miss.
+        """
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def _evict(self):
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM entries WHERE created < ?', (time.time() - self.ttl,))
+
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop the least recently used entries until the cache fits again
+        excess = total - self.max_bytes
+        for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall():
+            if excess <= 0:
+                break
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            excess -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit and miss counters, number of entries and total size in bytes.
+        """
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache(path=None, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+    """
+    Returns the process-wide persistent result cache.
+    """
+    path = path or os.path.join(DEFAULT_CACHE_DIR, 'results.sqlite')
+    return ResultCache(path, max_bytes=max_bytes, ttl=ttl)
@@ -1,15 +1,17 @@
 from plotly.subplots import make_subplots
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 
-from backend.ee import create_average_absolute_correlation_matrix
+from backend.ee import create_average_absolute_correlation_matrix, correlation_matrix_to_pairs
 
 def plot_3d_correlation_scatter_with_heatmap(correlations, features, title, correlation_type, groups):
     """
     Plots a 3D scatter chart of correlations with an average absolute correlation heatmap.
 
     Args:
-        correlations (dict): Dictionary with group labels as keys and lists of correlation data as values.
+        correlations (dict): Dictionary with group labels as keys and lists of correlation data or
+            correlation matrices as values.
         features (list): List of feature names.
         title (str): Title of the plot.
         correlation_type (str): Type of correlation (e.g., "Pearson's" or "Spearman's").
@@ -28,6 +30,9 @@ def plot_3d_correlation_scatter_with_heatmap(correlations, features, title, corr
 
     # 3D Scatter Plot
     for group_label, corr_data in correlations.items():
+        if isinstance(corr_data, np.ndarray):
+            corr_data = correlation_matrix_to_pairs(corr_data, features)
+
         x = [data[0] for data in corr_data]
         y = [data[1] for data in corr_data]
         z = [data[2] for data in corr_data]
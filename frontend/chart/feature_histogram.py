@@ -1,41 +1,23 @@
 import streamlit as st
 import plotly.express as px
-import ee
 import pandas as pd
 
 from backend.obs_group import *
+from backend.ee import add_feature_stats_to_groups
 
-@st.cache_data()
-def get_cached_histogram(_feature_image, _aoi, feature, group_hash):
-    # Get the histogram for this feature/band
-    histogram_result = _feature_image.select(feature).reduceRegion(
-        reducer=ee.Reducer.histogram(maxBuckets=50),
-        geometry=_aoi,
-        scale=50,
-        maxPixels=1e9
-    ).getInfo()
 
-    hist = histogram_result[feature]
-
-    return hist
-def get_histogram_data(observation_groups, group_hash, features):
+def get_histogram_data(observation_groups, group_hash, features, use_disk_cache=False):
     all_data = []
-    total_groups = len(observation_groups)
-    total_features = len(features)
-    group_progress = st.progress(0)
 
-    for j, group in enumerate(observation_groups):
-        feature_image = group['feature_image']
-        aoi = group['aoi_ee']
-        label = group['label']
-        group_progress.progress((j + 1) / total_groups, text=f"Getting Histograms inside {label} ...")
-        group_hash = hash_single_observation_group(group)
+    # Histograms are part of the shared per-group statistics stage
+    with st.spinner("Getting Histograms ..."):
+        all_stats = add_feature_stats_to_groups(observation_groups, features, use_disk_cache=use_disk_cache)
 
-        feature_progress = st.progress(0)
-        for i, feature in enumerate(features):
-            feature_progress.progress((i + 1) / total_features, text=f"For {feature} band ...")
+    for group, feature_stats in zip(observation_groups, all_stats):
+        label = group['label']
 
-            histogram = get_cached_histogram(feature_image, aoi, feature, group_hash)
+        for feature in features:
+            histogram = feature_stats[feature]['histogram']
 
             # Extract bucket means and histogram counts
             bucket_means = histogram.get('bucketMeans', [])
@@ -54,11 +36,6 @@ def get_histogram_data(observation_groups, group_hash, features):
 
             all_data.append(df[['Feature', 'Group', 'Value']])
 
-        feature_progress.empty()
-
-    group_progress.empty()
-
-
     # Combine all data into a single DataFrame
     df = pd.concat(all_data, ignore_index=True)
     return df
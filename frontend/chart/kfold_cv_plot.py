@@ -1,73 +1,103 @@
 import streamlit as st 
 from matplotlib import pyplot as plt
 import matplotlib.colors as plt_colors
+from matplotlib.patches import Patch
 import numpy as np
 import pandas as pd
 
-@st.cache_resource()
-def plot_kfold_splits(X, y, _cv, k):
+from backend.model_selection import split_inner_cv
+
+MAX_SAMPLE_MARKERS = 2000  # Above this, samples are aggregated into bins
+SPLIT_BINS = 400
+SPLIT_LABELS = np.array(['Unassigned', 'Training', 'Validation'])
+TRAIN_COLOR, VALIDATION_COLOR = '#440154', '#fde725'
+NON_FLOODED_COLOR, FLOODED_COLOR = '#2ca02c', '#01549f'
+
+
+def get_split_assignments(X, y, cv, coords=None):
+    """
+    Runs the cross-validator and returns the role of each sample in each split.
+
+    Returns:
+    np.ndarray: int8 array of shape (splits, samples) with -1 for unassigned (e.g. left out by a buffer),
+        0 for training and 1 for validation.
+    """
+    splits = list(split_inner_cv(cv, X, y, coords))
+    assignments = np.full((len(splits), len(y)), -1, dtype=np.int8)
+    for ii, (tr, tt) in enumerate(splits):
+        assignments[ii, tr] = 0
+        assignments[ii, tt] = 1
+    return assignments
+
+
+def get_split_table(assignments, y):
+    # One row per sample and split, built column-wise
+    k, n = assignments.shape
+    return pd.DataFrame({
+        'Sample': np.tile(np.arange(n), k),
+        'Fold': np.repeat(np.arange(k), n),
+        'Split': pd.Categorical.from_codes(assignments.ravel() + 1, SPLIT_LABELS),
+        'Class': np.tile(y, k)
+    })
+
+
+def bin_fraction(values, valid, n_bins):
+    # Mean of values over the valid samples of each of n_bins equal-width sample bins, NaN for empty bins
+    bins = np.minimum(np.arange(len(values)) * n_bins // max(len(values), 1), n_bins - 1)
+    totals = np.bincount(bins[valid], weights=values[valid], minlength=n_bins)
+    counts = np.bincount(bins[valid], minlength=n_bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def plot_kfold_splits(_fold, _cv, fold_key, cv_key):
     """
-    Plot K-Fold splits along with class labels using specified colors.
+    Plot K-Fold splits of the training split of a LOGO fold along with class labels.
+
+    Up to MAX_SAMPLE_MARKERS samples are drawn one marker each. Larger splits are drawn as strips of
+    SPLIT_BINS bins, colored by the share of validation samples (split rows) or flooded samples (class row).
 
     Parameters:
-    X (pd.DataFrame): Feature data DataFrame.
-    y (pd.DataFrame): Target labels DataFrame with a 'label' column.
-    _cv: Cross-validation object.
-    k (int): Number of splits.
+    _fold (Fold): LOGO fold, see FoldStore.
+    _cv: Inner cross-validator.
+    fold_key (str): Fingerprint of the fold, the cache key instead of the sample data.
+    cv_key (str): Description of _cv, e.g. its repr.
 
     Returns:
     df (pd.DataFrame): DataFrame with split information.
     fig (plt.Figure): Figure object for the plot.
     """
+    X, y = _fold.X_train(), _fold.y_train()
+    assignments = get_split_assignments(X, y, _cv, _fold.coords_train())
+    k, n = assignments.shape
+    df = get_split_table(assignments, y)
+
     fig, ax = plt.subplots()
 
-    # Create color maps for training/testing and class labels
-    cv_cmap = plt_colors.ListedColormap(['#440154', '#fde725'])
-    class_cmap = plt_colors.ListedColormap(['#2ca02c', '#01549f'])
-
-    # Initialize a DataFrame to store split information
-    split_info = []
-
-    # Generate the training/testing visualizations for each CV split
-    for ii, (tr, tt) in enumerate(_cv.split(X=X, y=y['label'])):
-        # Fill in indices with the training/test groups
-        indices = np.array([np.nan] * len(X))
-        indices[tt] = 1
-        indices[tr] = 0
-
-        # Store the split information in the DataFrame
-        for idx in range(len(indices)):
-            split_info.append({
-                'Sample': idx,
-                'Fold': ii,
-                'Split': 'Validation' if indices[idx] == 1 else 'Training' if indices[idx] == 0 else 'Unassigned',
-                'Class': y.iloc[idx]['label']  # Accessing the label column
-            })
-
-        # Visualize the results
-        ax.scatter(
-            range(len(indices)),
-            [ii + 0.5] * len(indices),
-            c=indices,
-            marker="_",
-            lw=10,
-            cmap=cv_cmap,
-            vmin=-0.2,
-            vmax=1.2,
-            label='Training' if ii == 0 else 'Validation'
-        )
-
-    # Convert the split information to a DataFrame
-    df = pd.DataFrame(split_info)
-
-    # Plot the data classes at the end
-    scatter = ax.scatter(
-        range(len(X)), [ii + 1.5] * len(X), c=y['label'], marker="_", lw=10, cmap=class_cmap
-    )
+    if n <= MAX_SAMPLE_MARKERS:
+        cv_cmap = plt_colors.ListedColormap([TRAIN_COLOR, VALIDATION_COLOR])
+        class_cmap = plt_colors.ListedColormap([NON_FLOODED_COLOR, FLOODED_COLOR])
+        split_values = np.where(assignments < 0, np.nan, assignments)
+        for ii in range(k):
+            ax.scatter(np.arange(n), np.full(n, ii + 0.5), c=split_values[ii], marker="_", lw=10, cmap=cv_cmap,
+                       vmin=-0.2, vmax=1.2)
+        ax.scatter(np.arange(n), np.full(n, k + 0.5), c=y, marker="_", lw=10, cmap=class_cmap, vmin=0, vmax=1)
+    else:
+        cv_cmap = plt_colors.LinearSegmentedColormap.from_list('split_share', [TRAIN_COLOR, VALIDATION_COLOR])
+        class_cmap = plt_colors.LinearSegmentedColormap.from_list('class_share', [NON_FLOODED_COLOR, FLOODED_COLOR])
+        strips = [(bin_fraction(assignments[ii].astype(float), assignments[ii] >= 0, SPLIT_BINS), cv_cmap)
+                  for ii in range(k)]
+        strips.append((bin_fraction(y.astype(float), np.ones(n, dtype=bool), SPLIT_BINS), class_cmap))
+        for ii, (strip, cmap) in enumerate(strips):
+            ax.imshow(strip[np.newaxis], aspect='auto', cmap=cmap, vmin=0, vmax=1, interpolation='nearest',
+                      extent=(0, n, ii + 0.8, ii + 0.2))
 
     # Adding legend for the classes
-    legend1 = ax.legend(*scatter.legend_elements(), loc='lower left', bbox_to_anchor=(0.5, -0.3), frameon=False, facecolor='none')
-    ax.add_artist(legend1)
+    class_legend = ax.legend(handles=[Patch(color=NON_FLOODED_COLOR, label='Non-Flooded'),
+                                      Patch(color=FLOODED_COLOR, label='Flooded')],
+                             loc='lower left', bbox_to_anchor=(0.5, -0.3), frameon=False, facecolor='none')
+    ax.add_artist(class_legend)
 
     # Formatting
     yticklabels = list(range(k)) + ["Class"]
@@ -76,6 +106,7 @@ def plot_kfold_splits(X, y, _cv, k):
         yticklabels=yticklabels,
         xlabel="Sample",
         ylabel="SKF-CV Folds",
+        xlim=[0, max(n, 1)],
         ylim=[k + 1.2, -0.2],
     )
 
@@ -83,6 +114,7 @@ def plot_kfold_splits(X, y, _cv, k):
     ax.set_facecolor('none')
 
     # Adding legend for the splits
-    ax.legend(['Validation', 'Training'], loc='lower right', frameon=False, bbox_to_anchor=(0.5, -0.3), facecolor='none')
+    ax.legend(handles=[Patch(color=VALIDATION_COLOR, label='Validation'), Patch(color=TRAIN_COLOR, label='Training')],
+              loc='lower right', frameon=False, bbox_to_anchor=(0.5, -0.3), facecolor='none')
 
     return df, fig
@@ -9,11 +9,17 @@ import matplotlib.path as mpath
 from matplotlib.patches import ConnectionPatch
 import hydralit_components as hc
 
+from backend.utils.geometry import get_lod_gdf
+
 def plot_all_aois(aoi_ground_truth_pairs):
     figures = []
     all_bounds = []
     colors = list(viridis)  # Distinct vis_params for each AOI
 
+    # Draw the simplified render variants
+    aoi_ground_truth_pairs = [(get_lod_gdf(aoi, 'render'), get_lod_gdf(ground_truth, 'render'), label, date)
+                              for aoi, ground_truth, label, date in aoi_ground_truth_pairs]
+
     for i, (aoi, ground_truth, label, date) in enumerate(aoi_ground_truth_pairs):
         fig = plt.figure(figsize=(6, 6))
 
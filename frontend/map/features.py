@@ -1,11 +1,14 @@
 import streamlit as st
-from .utils import plot_ee_image
+from .utils import plot_ee_image, plot_raster_thumbnail
 from static.vis_params import feature_vis_params
+from backend.compute import get_compute_backend
+from backend.obs_group import get_observation_group_by_label
 
 def plot_feature_maps(selected_label, features):
     # Find the selected observation group
-    selected_group = next(group for group in st.session_state.observation_groups if group['label'] == selected_label)
+    selected_group = get_observation_group_by_label(selected_label)
     feature_image = selected_group['feature_image']
+    backend = get_compute_backend()
 
     progress_bar = st.progress(0)
     cols = st.columns(len(features))
@@ -19,7 +22,7 @@ def plot_feature_maps(selected_label, features):
             label = f"{feature} - {selected_group['label']}"
 
             with st.spinner(f"Plotting Map of {feature} inside {selected_group['label']}..."):
-                image = feature_image.select(feature)
+                image = feature_image.select([feature])
                 vis_params = feature_vis_params.get(feature, {}).copy()
 
                 if 'min' not in vis_params:
@@ -27,7 +30,11 @@ def plot_feature_maps(selected_label, features):
                 if 'max' not in vis_params:
                     vis_params['max'] = float(selected_group['feature_min_max'][feature]['max'])
 
-                figure = plot_ee_image(image, vis_params, label, _discrete=False)
+                if backend.name == 'ee':
+                    figure = plot_ee_image(image, vis_params, label, _discrete=False)
+                else:
+                    rgba, extent = backend.thumbnail(selected_group, feature_image, feature, vis_params)
+                    figure = plot_raster_thumbnail(rgba, extent, vis_params, label)
                 figures[feature] = figure
 
     progress_bar.empty()
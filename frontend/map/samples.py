@@ -1,6 +1,7 @@
 from matplotlib import pyplot as plt
 import cartopy.crs as ccrs
 
+from backend.utils.geometry import get_lod_gdf
 from .utils import cartoee_default_map_customization
 
 def plot_sample_coordinates(samples_df, aoi):
@@ -8,6 +9,7 @@ def plot_sample_coordinates(samples_df, aoi):
     fig, ax = plt.subplots(figsize=(5, 7), subplot_kw={'projection': ccrs.PlateCarree()})
 
     # Add AOI
+    aoi = get_lod_gdf(aoi, 'render')
     aoi.plot(ax=ax, edgecolor='red', linewidth=2, facecolor='none', transform=ccrs.PlateCarree(), label='AOI')
 
     # Plot sampled points
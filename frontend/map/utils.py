@@ -80,4 +80,23 @@ def plot_ee_image(_image, _vis_params, label, _discrete=False):
     # Add coordinate grid, scale bar, north arrow and make background transparent
     fig,ax = cartoee_default_map_customization(fig,ax,bounds)
 
-    return fig
\ No newline at end of file
+    return fig
+
+def plot_raster_thumbnail(rgba, extent, vis_params, label):
+    # Create the chart from a pre-rendered RGBA thumbnail
+    fig = plt.figure(figsize=(7, 5))
+    ax = fig.add_subplot(projection=ccrs.PlateCarree())
+    ax.imshow(rgba, extent=extent, origin='upper', transform=ccrs.PlateCarree())
+    ax.set_extent(extent, crs=ccrs.PlateCarree())
+
+    # Add colorbar at the bottom center
+    cax = ax.figure.add_axes([0.25, -0.05, 0.5, 0.02])
+    cartoee.add_colorbar(ax, cax=cax, vis_params=vis_params, orientation='horizontal', label=label)
+
+    # Bounds in the GeoDataFrame layout (min_lon, min_lat, max_lon, max_lat)
+    bounds = (extent[0], extent[2], extent[1], extent[3])
+
+    # Add coordinate grid, scale bar, north arrow and make background transparent
+    fig, ax = cartoee_default_map_customization(fig, ax, bounds)
+
+    return fig
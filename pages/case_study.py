@@ -1,65 +1,51 @@
 # standard library imports
 from datetime import datetime
 import os
-from tempfile import TemporaryDirectory
 
 # related third party imports
 import streamlit as st
 import ee
-import geopandas as gpd
 import matplotlib.pyplot as plt
-from shapely.ops import unary_union
 import hydralit_components as hc
 
 # local app specific imports
 from backend.obs_group import *
-from backend.case_study import load_example, handle_file_upload, NUM_SETS
-from backend.ee import convert_observation_groups_to_ee, add_feature_image_to_group
+from backend.case_study import (load_example, handle_file_upload, read_hydrography_upload, get_upload_key,
+                                merge_hydrography_with_ground_truth, NUM_SETS, UPLOAD_TYPES)
+from backend.ee import (convert_observation_groups_to_ee, add_feature_image_to_group, run_coverage_preflight,
+                        prefetch_feature_stats, get_prefetch_status)
+from backend.compute import COMPUTE_BACKENDS, DEFAULT_COMPUTE_BACKEND, get_compute_backend
 from frontend.map import plot_all_aois
-from backend.case_study import NUM_SETS, EXAMPLE_FOLDERS
 
 
-def merge_hydrography_with_ground_truth(ground_truth_gdf, hydrography_gdf):
-    # Ensure both GeoDataFrames have the same CRS
-    if ground_truth_gdf.crs != hydrography_gdf.crs:
-        hydrography_gdf = hydrography_gdf.to_crs(ground_truth_gdf.crs)
+@st.fragment(run_every=2)
+def show_prefetch_progress():
+    done, _, total = get_prefetch_status()
+    if done < total:
+        st.progress(done / total, text=f"Prefetching feature statistics ({done}/{total} groups)")
+    else:
+        # Rerun the page once to replace the polling fragment with the final status
+        st.rerun()
 
-    # Reset indices to avoid warnings
-    ground_truth_gdf = ground_truth_gdf.reset_index(drop=True)
-    hydrography_gdf = hydrography_gdf.reset_index(drop=True)
 
-    # Combine all geometries from both GeoDataFrames
-    all_geometries = list(ground_truth_gdf.geometry) + list(hydrography_gdf.geometry)
+def show_prefetch_status():
+    done, failed, total = get_prefetch_status()
+    if done < total:
+        show_prefetch_progress()
+    elif failed:
+        st.warning(f"Prefetching failed for {failed} of {total} groups, they are computed on demand.", icon="⚠")
+    elif total:
+        st.caption(f"Feature statistics of all {total} groups are ready.")
 
-    # Merge geometries
-    merged_geometry = unary_union(all_geometries)
 
-    # Create a new GeoDataFrame with the merged geometry
-    merged_gdf = gpd.GeoDataFrame(geometry=[merged_geometry], crs=ground_truth_gdf.crs)
+def prefetch_group_artifacts(msg_col):
+    # Warm the statistics behind histograms and map extrema while the user reviews the AOI maps
+    prefetch_feature_stats(get_all_observation_groups(), st.session_state.all_features,
+                           st.session_state.get('compute_backend', DEFAULT_COMPUTE_BACKEND),
+                           use_disk_cache=st.session_state.use_disk_cache)
+    with msg_col:
+        show_prefetch_status()
 
-    # Preserve attributes from ground truth
-    for col in ground_truth_gdf.columns:
-        if col != 'geometry':
-            merged_gdf[col] = ground_truth_gdf[col].iloc[0]  # Assuming we want to keep the first value
-
-    return merged_gdf
-
-
-def handle_hydrography_upload(uploaded_files, tmpdir):
-    if uploaded_files and len(uploaded_files) > 0:
-        required_files = [".shp", ".shx", ".dbf"]
-        uploaded_filenames = [uploaded_file.name for uploaded_file in uploaded_files]
-
-        if all(any(fname.endswith(ext) for fname in uploaded_filenames) for ext in required_files):
-            for uploaded_file in uploaded_files:
-                file_path = os.path.join(tmpdir, uploaded_file.name)
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-
-            shapefile_path = next(fname for fname in uploaded_filenames if fname.endswith(".shp"))
-            return gpd.read_file(os.path.join(tmpdir, shapefile_path))
-
-    return None
 
 def case_study():
     initialize_observation_groups(NUM_SETS)
@@ -67,12 +53,38 @@ def case_study():
     col1, col2, col3 = st.columns([4, 11, 5])
 
     with col1:
-        for i in range(NUM_SETS):
+        backend_names = list(COMPUTE_BACKENDS)
+        st.session_state.compute_backend = st.selectbox(
+            "Compute Backend", backend_names,
+            index=backend_names.index(st.session_state.get('compute_backend', DEFAULT_COMPUTE_BACKEND)))
+        use_local_backend = get_compute_backend().name == 'local'
+
+        with st.expander("**Bulk Import**"):
+            import_path = st.text_input(
+                "Folder or Manifest",
+                help="Folder with one '<YYYY>_<MM>_<DD>_<Label>' subfolder per group, or a CSV/JSON manifest "
+                     "with the columns label, date, aoi, ground_truth and optionally hydrography and scene_path",
+                key='bulk_import_path'
+            )
+            if st.button("Import Groups", use_container_width=True, disabled=not import_path):
+                try:
+                    st.toast(f"Imported {import_observation_groups(import_path)} observation groups")
+                except (ValueError, OSError) as e:
+                    st.error(f"Error importing observation groups: {str(e)}")
+
+        # Only the groups of the current page get widgets and maps, the others stay unloaded
+        num_groups = len(st.session_state.observation_groups)
+        num_pages = max(1, -(-num_groups // GROUPS_PER_PAGE))
+        page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1,
+                               key='group_page') if num_pages > 1 else 1
+        page_indices = range((page - 1) * GROUPS_PER_PAGE, min(page * GROUPS_PER_PAGE, num_groups))
+
+        for i in page_indices:
             with st.expander(f"**Define Case Study {i+1}**"):
                 st.write("**Area of Interest**")
                 aoi_files = st.file_uploader(
                     f'AOI Set {i+1}',
-                    type=["shp", "dbf", "shx", "prj"],
+                    type=UPLOAD_TYPES,
                     accept_multiple_files=True,
                     key=f'aoi_files_{i+1}'
                 )
@@ -81,7 +93,7 @@ def case_study():
                 st.write("**Ground Truth**")
                 gt_files = st.file_uploader(
                     f'Ground Truth Set {i+1}',
-                    type=["shp", "dbf", "shx", "prj"],
+                    type=UPLOAD_TYPES,
                     accept_multiple_files=True,
                     key=f'ground_truth_files_{i+1}'
                 )
@@ -90,7 +102,7 @@ def case_study():
                 st.write("**Hydrography**")
                 hydro_files = st.file_uploader(
                     f'Hydrography Set {i + 1}',
-                    type=["shp", "dbf", "shx", "prj"],
+                    type=UPLOAD_TYPES,
                     accept_multiple_files=True,
                     key=f'hydro_files_{i + 1}'
                 )
@@ -111,47 +123,58 @@ def case_study():
                 )
                 update_observation_group(i, label=label)
 
-                # Process and merge hydrography data
-                with TemporaryDirectory() as tmpdir:
-                    hydrography_gdf = handle_hydrography_upload(hydro_files, tmpdir)
-                    if hydrography_gdf is not None:
-                        ground_truth_gdf = get_observation_group(i).get('ground_truth')
-                        if ground_truth_gdf is not None:
-                            try:
-                                merged_gdf = merge_hydrography_with_ground_truth(ground_truth_gdf, hydrography_gdf)
-                                update_observation_group(i, ground_truth=merged_gdf)
-                                st.toast(f"Hydrography data merged with ground truth for Group {i + 1}")
-                            except Exception as e:
-                                st.error(f"Error merging hydrography data for Group {i + 1}: {str(e)}")
-                        else:
-                            st.warning(
-                                f"Ground truth data not available for Group {i + 1}. Upload ground truth before hydrography.")
-                    elif hydro_files:
-                        st.error(
-                            f"Error processing hydrography files for Group {i + 1}. Ensure all required files are uploaded.")
+                if use_local_backend:
+                    st.write("**Local Scene**")
+                    scene_path = st.text_input(
+                        f"Scene Path Set {i+1}",
+                        value=get_observation_group(i).get('scene_path', ''),
+                        help="Folder with VV, VH, angle and DEM GeoTIFFs, or a multi-band GeoTIFF",
+                        key=f'scene_path_input_{i+1}'
+                    )
+                    update_observation_group(i, scene_path=scene_path)
+
+                # Process and merge hydrography data, unless this upload is already merged into the ground truth
+                upload_key = get_upload_key(hydro_files)
+                merge_memo = get_observation_group(i).get('_hydrography_merge')
+                if merge_memo is not None and merge_memo[0] == upload_key \
+                        and merge_memo[2] is get_observation_group(i).get('ground_truth'):
+                    continue
+
+                if merge_memo is not None and merge_memo[0] == upload_key:
+                    hydrography_gdf = merge_memo[1]
+                else:
+                    hydrography_gdf = read_hydrography_upload(hydro_files)
+                if hydrography_gdf is not None:
+                    ground_truth_gdf = get_observation_group(i).get('ground_truth')
+                    if ground_truth_gdf is not None:
+                        try:
+                            merged_gdf = merge_hydrography_with_ground_truth(ground_truth_gdf, hydrography_gdf)
+                            update_observation_group(i, ground_truth=merged_gdf,
+                                                     _hydrography_merge=(upload_key, hydrography_gdf, merged_gdf))
+                            st.toast(f"Hydrography data merged with ground truth for Group {i + 1}")
+                        except Exception as e:
+                            st.error(f"Error merging hydrography data for Group {i + 1}: {str(e)}")
+                    else:
+                        st.warning(
+                            f"Ground truth data not available for Group {i + 1}. Upload ground truth before hydrography.")
+                elif hydro_files:
+                    st.error(
+                        f"Error processing hydrography files for Group {i + 1}. Ensure all required files are uploaded.")
+
+    if col1.button("Add Group", use_container_width=True):
+        add_observation_group()
+        st.rerun()
 
     if col1.button("Initialize Example", type="primary", use_container_width=True):
+            # Example groups are read, merged with their hydrography and cached once per server process
             load_example()
-            # Load and merge example hydrography data
-            for i, folder in enumerate(EXAMPLE_FOLDERS):
-                if i >= NUM_SETS:
-                    break
-                folder_path = os.path.join("example_data", folder)
-                hydrography_path = os.path.join(folder_path, "hydrographyA.shp")
-                if os.path.exists(hydrography_path):
-                    hydrography_gdf = gpd.read_file(hydrography_path)
-                    ground_truth_gdf = get_observation_group(i).get('ground_truth')
-                    if ground_truth_gdf is not None:
-                        merged_gdf = merge_hydrography_with_ground_truth(ground_truth_gdf, hydrography_gdf)
-                        update_observation_group(i, ground_truth=merged_gdf)
-            st.toast("Example data initialized and hydrography merged successfully!")
 
     with col2:
-        observation_groups = get_all_observation_groups()
+        page_groups = [st.session_state.observation_groups[i] for i in page_indices]
         valid_groups = [
             (group['aoi'], group['ground_truth'], group['label'], group['date'])
-            for group in observation_groups
-            if 'aoi' in group and 'ground_truth' in group and isinstance(group['aoi'], gpd.GeoDataFrame) and isinstance(group['ground_truth'], gpd.GeoDataFrame)
+            for group in page_groups
+            if group.is_valid
         ]
 
         if valid_groups:
@@ -188,21 +211,61 @@ def case_study():
             st.write("No valid data available for visualization. Please upload or initialize data.")
 
     if are_observation_groups_valid():
+        # Drop the artifacts of groups whose AOI, ground truth, date or label changed
+        refresh_artifacts()
+        backend = get_compute_backend()
+
+        # Bands of the feature stack. The later pages choose their inputs among these, so the stack holds the
+        # session's whole feature list and is rebuilt when that list changes.
+        features = list(st.session_state.all_features)
+
+        def get_feature_image_params(group):
+            return {'features': features, 'backend': backend.name, 'scene_path': group.get('scene_path')}
+
+        if use_local_backend:
+            for i, group in enumerate(st.session_state.observation_groups):
+                if group and not is_artifact_current(group, 'feature_image', get_feature_image_params(group)):
+                    try:
+                        feature_image = backend.feature_stack(group, features)
+                    except (ImportError, OSError, ValueError, KeyError) as e:
+                        col1.error(f"Error loading local scene for {group['label']}: {str(e)}")
+                        st.stop()
+                    update_artifact(i, 'feature_image', get_feature_image_params(group), feature_image=feature_image,
+                                    group_hash=hash_single_observation_group(group))
+            prefetch_group_artifacts(col1)
+            return
+
         convert_observation_groups_to_ee()
 
-        progress_bar = st.progress(0)
+        # Only groups with a changed AOI, date or feature list need a new feature image
+        outdated = []
         for i, group in enumerate(st.session_state.observation_groups):
-            progress = int((i + 1) / len(st.session_state.observation_groups) * 100)
-            progress_bar.progress(progress, text=f"Processing {group['label']} ({group['date']})")
-
-            current_group_hash = hash_single_observation_group(group)
-
-            # Check if the group hash has changed or if the feature image doesn't exist
-            if 'group_hash' not in group or group['group_hash'] != current_group_hash or 'feature_image' not in group:
-                feature_image = add_feature_image_to_group(i, group, col1)
-
-                # Update group with new feature image and hash
-                update_observation_group(i, feature_image=feature_image, group_hash=current_group_hash)
-
-
-        progress_bar.empty()
\ No newline at end of file
+            if group and not is_artifact_current(group, 'feature_image', get_feature_image_params(group)):
+                outdated.append((i, group, hash_single_observation_group(group)))
+
+        if outdated:
+            # Check the coverage of all outdated groups in one request
+            with st.spinner("Checking Sentinel-1 coverage ..."):
+                coverage_report = run_coverage_preflight([group for _, group, _ in outdated])
+
+            with col1.expander("**Sentinel-1 Coverage Report**"):
+                st.dataframe(
+                    [{'Site': c['label'], 'Date': c['date'], 'Scenes': c['count'], 'Coverage': f"{c['coverage']:.1%}",
+                      'Acquisitions': ', '.join(c['acquisition_ids'])} for c in coverage_report],
+                    hide_index=True, use_container_width=True)
+
+            # Report all coverage problems at once before stopping
+            missing = [coverage for coverage in coverage_report if coverage['status'] == 'missing']
+            for coverage in missing:
+                col1.error(f"No Sentinel-1 imagery available for {coverage['label']} ({coverage['date']}).", icon="⚠")
+            if missing:
+                st.stop()
+
+            for (i, group, current_group_hash), coverage in zip(outdated, coverage_report):
+                feature_image = add_feature_image_to_group(i, group, col1, coverage, features)
+
+                # Update group with new feature image and hash, dropping stats and samples of the previous one
+                update_artifact(i, 'feature_image', get_feature_image_params(group), feature_image=feature_image,
+                                group_hash=current_group_hash)
+
+        prefetch_group_artifacts(col1)
\ No newline at end of file
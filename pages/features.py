@@ -9,7 +9,9 @@ from streamlit_option_menu import option_menu
 
 # Local Application-Specific Imports
 from backend.obs_group import *
-from backend.ee import add_feature_min_max, compute_pairwise_correlations_for_groups, get_importances
+from backend.compute import get_compute_backend
+from backend.ee import (add_feature_min_max_to_groups, compute_pairwise_correlations_for_groups,
+                        compute_correlation_matrices_for_groups, get_importances)
 from frontend.map import plot_feature_maps
 from frontend.chart import (get_histogram_data, create_ridgeline_plot, plot_3d_correlation_scatter_with_heatmap,
                             plot_importances)
@@ -29,7 +31,8 @@ def features():
 
     observation_groups = get_all_observation_groups()
     observation_group_labels = [group['label'] for group in observation_groups]
-    observation_groups_hash = hash_observation_groups()
+    # Feature image fingerprints cover the groups, the features, the backend and the scenes
+    observation_groups_hash = tuple(get_artifact_fingerprint(group, 'feature_image') for group in observation_groups)
 
     col1, col2 = st.columns([1, 4])
 
@@ -51,17 +54,10 @@ def features():
 
     with col2:
         if map_features:
-            # Get feature min_max
-            progress_bar = st.progress(0)
-            for i, group in enumerate(observation_groups):
-                progress = int((i + 1) / len(observation_groups) * 100)
-                map_group_hash = hash_single_observation_group(group)
-                progress_bar.progress(progress, text=f"Calculating extrema for {group['label']} on {group['date']} ...")
-
-                # Add min/max values
-                add_feature_min_max(i, group, features_to_map, map_group_hash)
-
-            progress_bar.empty()
+            # Get feature min_max for all groups in one batched request
+            with st.spinner("Calculating extrema ..."):
+                add_feature_min_max_to_groups(observation_groups, features_to_map,
+                                              use_disk_cache=st.session_state.use_disk_cache)
 
             plot_feature_maps(group_to_map, features_to_map)
 
@@ -92,7 +88,8 @@ def features():
     with col2:
         if plot_features:
             if chart == 'Ridgeline':
-                data = get_histogram_data(observation_groups, observation_groups_hash, features_to_plot)
+                data = get_histogram_data(observation_groups, observation_groups_hash, features_to_plot,
+                                          use_disk_cache=st.session_state.use_disk_cache)
                 st.session_state.ridgeline_fig = create_ridgeline_plot(data, observation_groups_hash, features_to_plot)
             else:
                 st.warning("Not implemented yet")
@@ -124,15 +121,20 @@ def features():
             if reducer == 'Difference':
                 st.warning("Not implemented yet")
             else:
-                if reducer == 'Pearson':
-                    ee_reducer = ee.Reducer.pearsonsCorrelation()
-                if reducer == 'Spearman':
-                    ee_reducer = ee.Reducer.spearmansCorrelation()
-
                 with st.spinner('Computing Correlation ...'):
-                    correlation = compute_pairwise_correlations_for_groups(observation_groups,
-                                                                           features_to_analyse,
-                                                                           ee_reducer)
+                    backend = get_compute_backend()
+                    if backend.name != 'ee':
+                        correlation = {group['label']: backend.correlation_matrix(
+                            group, group['feature_image'], features_to_analyse, method=reducer.lower())
+                            for group in observation_groups}
+                    elif reducer == 'Pearson':
+                        # Full matrix from one covariance reduction per group
+                        correlation = compute_correlation_matrices_for_groups(
+                            observation_groups, features_to_analyse, use_disk_cache=st.session_state.use_disk_cache)
+                    elif reducer == 'Spearman':
+                        correlation = compute_pairwise_correlations_for_groups(
+                            observation_groups, features_to_analyse, ee.Reducer.spearmansCorrelation(),
+                            use_disk_cache=st.session_state.use_disk_cache)
 
                 with st.spinner('Plotting Correlation ...'):
                     st.session_state.correlation_fig = plot_3d_correlation_scatter_with_heatmap(
@@ -4,6 +4,8 @@ import json
 import pandasql as psql
 import os
 
+from backend.utils import get_result_cache
+
 
 def ee_init():
     # Load the service account credentials from Streamlit secrets
@@ -49,8 +51,14 @@ def home():
             st.toast(conn_test)
 
 
+        st.session_state.use_disk_cache = st.toggle("Persistent Result Cache", value=st.session_state.use_disk_cache)
+        cache_stats = get_result_cache().stats()
+        st.caption(f"{cache_stats['entries']} cached results ({cache_stats['bytes'] / 1024 ** 2:.1f} MB), "
+                   f"{cache_stats['hits']} hits / {cache_stats['misses']} misses")
+
         if st.button("Clear Cache and Restart App"):
             st.cache_data.clear()
+            get_result_cache().clear()
             st.rerun()
             st.toast("Cache cleared!", icon=":material/check_circle:")
 
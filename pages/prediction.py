@@ -2,6 +2,8 @@ import streamlit as st
 import geemap.ml as ml
 import ee
 
+from backend.obs_group import get_all_observation_groups
+
 def predict():
     st.title("Predict")
 
@@ -10,14 +12,15 @@ def predict():
         st.error("Please run model training and evaluation first.")
         return
 
-    # Get observation group labels
-    observation_group_labels = [group.get('label', f"Group {i}") for i, group in enumerate(st.session_state.logo_folds)]
+    # Fold index of each observation group label, fold i tests group i (folds are built on access)
+    observation_groups = get_all_observation_groups()
+    fold_indices = {observation_groups[i].label: i for i in range(len(st.session_state.logo_folds))}
 
     # Create selectbox for observation group
-    selected_group_label = st.selectbox("Select Observation Group to Predict", observation_group_labels)
+    selected_group_label = st.selectbox("Select Observation Group to Predict", list(fold_indices))
 
     # Find the fold index for the selected group
-    fold_index = next((i for i, fold in enumerate(st.session_state.logo_folds) if fold.get('label') == selected_group_label), None)
+    fold_index = fold_indices.get(selected_group_label)
 
     if fold_index is None:
         st.error(f"No fold found for the selected group: {selected_group_label}")
@@ -63,9 +66,9 @@ def predict():
 
     # Optionally, display the selected group's data
     if st.checkbox("Show Selected Group Data"):
-        selected_group = st.session_state.logo_folds[fold_index]
+        selected_fold = st.session_state.logo_folds[fold_index]
         st.subheader(f"Data for {selected_group_label}")
-        st.write("Training Data Shape:", selected_group['X_train'].shape)
-        st.write("Testing Data Shape:", selected_group['X_test'].shape)
-        st.write("Group Date:", selected_group.get('date', 'Not available'))
+        st.write("Training Data Shape:", (len(selected_fold.train_rows), len(selected_fold.store.feature_names)))
+        st.write("Testing Data Shape:", selected_fold.X_test().shape)
+        st.write("Group Date:", observation_groups[fold_index].get('date', 'Not available'))
         # Add any other relevant information from the group
@@ -6,11 +6,15 @@ import streamlit as st
 from streamlit_extras.chart_container import chart_container
 from streamlit_extras.stylable_container import stylable_container
 from streamlit_option_menu import option_menu
-from sklearn.model_selection import StratifiedKFold
 
 # Local Application-Specific Imports
 from backend.obs_group import *
-from backend.sampling import unify_ground_truth, get_stratified_sample, get_group_X_y, get_logo_folds
+from backend.compute import DEFAULT_COMPUTE_BACKEND, get_compute_backend
+from backend.utils.geometry import get_lod_gdf
+from backend.ee import get_ee_client
+from backend.sampling import (get_group_X_y, get_logo_folds,
+                              hash_sample_points, get_sample_pool, prune_sample_pools, DEFAULT_SAMPLE_SEED,
+                              INNER_CV_SCHEMES, create_inner_cv)
 from frontend.map import plot_sample_coordinates
 from frontend.chart import plot_kfold_splits
 from static.styles import opt_menu_style, training_container, testing_container
@@ -33,49 +37,87 @@ def sampling():
                 total_size = st.number_input("Samples per Group", min_value=100, value=500,
                                              step=10)
                 allocation = st.selectbox("Class Allocation", ["Proportional", "Equalized"])
+                seed = st.number_input("Random Seed", min_value=0, value=DEFAULT_SAMPLE_SEED, step=1)
+                snap_to_pixels = st.checkbox("Snap to Pixel Grid", value=True,
+                                             help="One sample per pixel of the feature image, without duplicates")
 
             with st.expander("**Validation Design**", expanded=True):
                 outer_input_dummy = st.selectbox("Outer Validation Loop", ['LOGO-CV'])
 
-                inner_input_dummy = st.selectbox("Inner Validation Loop", ['SKF-CV'])
+                inner_scheme = st.selectbox("Inner Validation Loop", INNER_CV_SCHEMES)
                 k_folds = st.number_input("K-Folds", min_value=2, value=5, step=1)
+                block_size = st.number_input("Block Size (m)", min_value=10, value=500, step=10,
+                                             help="Edge length of the spatial blocks, used by Spatial Block CV")
+                buffer = st.number_input("Buffer (m)", min_value=0, value=0, step=10,
+                                         help="Training points closer than this to a validation point are left "
+                                              "out, used by Spatial Block CV and Buffered CV")
             submitted = st.form_submit_button("Create Samples", use_container_width=True, type="primary")
 
         if submitted:
+            sampling_params = {'total_size': total_size, 'allocation': allocation, 'seed': seed,
+                               'snap_to_pixels': snap_to_pixels}
             progress_bar = col2.progress(0)
             total_groups = len(observation_groups)
-            for i, group in enumerate(observation_groups):
-                progress = (i + 1) / total_groups
-                progress_bar.progress(progress, text=f"Sampling from Group {group['label']}")
-
-                group_hash = hash_single_observation_group(group)
-                aoi = group['aoi']
-                ground_truth = unify_ground_truth(group)
-
-                with col2:
-                    with st.spinner(text=f"Getting sample points from {group['label']}"):
-                        if allocation == "Equalized":
-                            flooded_size = non_flooded_size = total_size // 2
-                        else:  # Proportional
-                            flooded_ratio = ground_truth.geometry.area.iloc[0] / aoi.geometry.area.iloc[0]
-                            flooded_size = int(total_size * flooded_ratio)
-                            non_flooded_size = total_size - flooded_size
-
-                        sample_coordinates = get_stratified_sample(aoi, ground_truth, flooded_size, non_flooded_size)
-
-                    with st.spinner(text=f"Compiling features and labels for observation group {group['label']}"):
-                        X, y = get_group_X_y(group, group_hash, sample_coordinates)
-
-                        update_observation_group(i, sample_coordinates=sample_coordinates, X=X, y=y)
-
+            client = get_ee_client()
+            features = tuple(st.session_state.all_features)
+            backend_name = st.session_state.get('compute_backend', DEFAULT_COMPUTE_BACKEND)
+            backend = get_compute_backend(backend_name)
+            extraction_jobs = []
+
+            # Geometries are loaded per batch, the extraction of a batch starts before the next batch is sampled
+            for batch in iter_group_batches(enumerate(observation_groups)):
+                for i, group in batch:
+                    progress = (i + 1) / total_groups
+                    progress_bar.progress(progress, text=f"Sampling from Group {group['label']}")
+
+                    aoi = get_lod_gdf(group['aoi'], 'exact')
+                    ground_truth = group.unified_ground_truth
+
+                    with col2:
+                        with st.spinner(text=f"Getting sample points from {group['label']}"):
+                            if allocation == "Equalized":
+                                flooded_size = non_flooded_size = total_size // 2
+                            else:  # Proportional
+                                flooded_ratio = group.flooded_area_ratio
+                                flooded_size = int(total_size * flooded_ratio)
+                                non_flooded_size = total_size - flooded_size
+
+                            # Grow the group's pool to the requested class sizes, only new points are extracted
+                            grid = backend.sampling_grid(group, group['feature_image']) if snap_to_pixels else None
+                            feature_image_fingerprint = get_artifact_fingerprint(group, 'feature_image')
+                            pool = get_sample_pool(feature_image_fingerprint, seed, grid)
+                            sizes = {1: flooded_size, 0: non_flooded_size}
+                            pool.draw(aoi, ground_truth, sizes)
+                            pending_points = pool.pending_points()
+
+                    future = None
+                    if len(pending_points):
+                        future = client.submit(get_group_X_y, group, feature_image_fingerprint, pending_points,
+                                               use_disk_cache=st.session_state.use_disk_cache,
+                                               features=features, backend_name=backend_name,
+                                               key=(feature_image_fingerprint, hash_sample_points(pending_points),
+                                                    features))
+                    extraction_jobs.append((i, pool, sizes, pending_points, future))
 
             progress_bar.empty()
+            prune_sample_pools({get_artifact_fingerprint(group, 'feature_image') for group in observation_groups})
+
+            # Collect the features and labels of all groups, extracted concurrently
+            with col2:
+                with st.spinner(text="Compiling features and labels for all observation groups"):
+                    for i, pool, sizes, pending_points, future in extraction_jobs:
+                        if future is not None:
+                            pool.add_extracted(pending_points, *future.result())
+                        sample_coordinates, X, y = pool.select(sizes)
+                        update_artifact(i, 'samples', sampling_params,
+                                        sample_coordinates=sample_coordinates, X=X, y=y)
 
             with st.spinner(text="Creating LOGO Folds ..."):
-                st.session_state.logo_folds = get_logo_folds(observation_groups)
-                # Stratified K-Fold CV
-                skf = StratifiedKFold(n_splits=k_folds)
-                st.session_state.skf = skf
+                # Inner cross-validator, stored as 'skf' whichever scheme is selected
+                skf = create_inner_cv(inner_scheme, k_folds, block_size=block_size, buffer=buffer)
+                update_artifact(None, 'folds', {'k_folds': k_folds, 'inner_scheme': inner_scheme,
+                                                'block_size': block_size, 'buffer': buffer},
+                                logo_folds=get_logo_folds(observation_groups), skf=skf)
 
             st.success("Sampling and Splitting completed successfully!")
             st.rerun()
@@ -92,21 +134,22 @@ def sampling():
 
             fold_names = [f"Fold {i + 1}" for i in range(len(folds))]
             with cols[0]:
-                selected_fold = option_menu(
-                    menu_title=None,
-                    options=fold_names,
-                    orientation="horizontal",
-                    styles=opt_menu_style,
-                )
+                # The horizontal menu only fits a page of folds, longer fold lists get a drop-down
+                if len(fold_names) <= GROUPS_PER_PAGE:
+                    selected_fold = option_menu(
+                        menu_title=None,
+                        options=fold_names,
+                        orientation="horizontal",
+                        styles=opt_menu_style,
+                    )
+                else:
+                    selected_fold = st.selectbox("Fold", fold_names, label_visibility="collapsed")
 
             selected_fold_idx = fold_names.index(selected_fold)
             fold = folds[selected_fold_idx]
 
-            # Layout for each fold: first column for testing group, other columns for training groups
-            cols = st.columns(len(fold['train_groups']) + 1)
-
             # Display the testing group in the first column
-            test_group_idx = fold['test_group']
+            test_group_idx = fold.test_group
             test_group = observation_groups[test_group_idx]
 
             col1, col2, col3 = st.columns([1, 1, 1])
@@ -126,6 +169,7 @@ def sampling():
                         with chart_container(sample_with_features):
                             fig = plot_sample_coordinates(sample, test_group['aoi'])
                             st.pyplot(fig)
+                        test_group.unload()
                         st.write(
                             f"***Figure {test_group['label']}:** {test_group['label']} Samples: **{flooded_count} "
                             f"Flooded** Samples in Blue and **{non_flooded_count} "
@@ -137,26 +181,33 @@ def sampling():
                 with stylable_container(key=f"train-container-{selected_fold_idx}",
                                         css_styles=training_container):
                     st.write('##### Training Split')
-                    for col_idx, train_group_idx in enumerate(fold['train_groups']):
-                        train_group = observation_groups[train_group_idx]
-
-                        st.write(f"**{train_group['label']}**")
-                        if 'sample_coordinates' in train_group:
-                            sample = train_group['sample_coordinates']
-                            # Merge sample coordinates with feature data
-                            sample_with_features = sample.join(test_group['X'].reset_index(drop=True))
-
-                            flooded_count = sample[sample['class'] == 1].shape[0]
-                            non_flooded_count = sample[sample['class'] == 0].shape[0]
-                            with chart_container(sample_with_features):
-                                fig = plot_sample_coordinates(sample, train_group['aoi'])
-                                st.pyplot(fig)
-                            st.write(
-                                f"***Figure {train_group['label']}:** {train_group['label']} Samples: **{flooded_count}"
-                                f" Flooded** Samples in Blue and **{non_flooded_count}"
-                                f" Non-Flooded** Samples in Green Within the Area of Interest in Red*")
-                        else:
-                            st.write(f"No samples generated for {train_group['label']} yet.")
+
+                    # One page of training groups at a time, each loaded only while its map is drawn
+                    train_groups = fold.train_groups
+                    num_pages = max(1, -(-len(train_groups) // GROUPS_PER_PAGE))
+                    page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1,
+                                           key='train_group_page') if num_pages > 1 else 1
+                    page_groups = train_groups[(page - 1) * GROUPS_PER_PAGE:page * GROUPS_PER_PAGE]
+
+                    for batch in iter_group_batches([(j, observation_groups[j]) for j in page_groups], batch_size=1):
+                        for _, train_group in batch:
+                            st.write(f"**{train_group['label']}**")
+                            if 'sample_coordinates' in train_group:
+                                sample = train_group['sample_coordinates']
+                                # Merge sample coordinates with feature data
+                                sample_with_features = sample.join(train_group['X'].reset_index(drop=True))
+
+                                flooded_count = sample[sample['class'] == 1].shape[0]
+                                non_flooded_count = sample[sample['class'] == 0].shape[0]
+                                with chart_container(sample_with_features):
+                                    fig = plot_sample_coordinates(sample, train_group['aoi'])
+                                    st.pyplot(fig)
+                                st.write(
+                                    f"***Figure {train_group['label']}:** {train_group['label']} Samples: "
+                                    f"**{flooded_count} Flooded** Samples in Blue and **{non_flooded_count}"
+                                    f" Non-Flooded** Samples in Green Within the Area of Interest in Red*")
+                            else:
+                                st.write(f"No samples generated for {train_group['label']} yet.")
 
             with col3:
                 with stylable_container(key=f"train-container-{selected_fold_idx}-kfold",
@@ -165,6 +216,10 @@ def sampling():
 
                     skf = st.session_state.skf
 
-                    df, fig = plot_kfold_splits(fold['X_train'], fold['y_train'], skf, 5)
-                    with chart_container(df):
-                        st.pyplot(fig)
\ No newline at end of file
+                    try:
+                        df, fig = plot_kfold_splits(fold, skf, fold.fingerprint, repr(skf))
+                    except ValueError as e:
+                        st.error(f"The inner cross-validation cannot split this fold: {e}", icon="⚠")
+                    else:
+                        with chart_container(df):
+                            st.pyplot(fig)
\ No newline at end of file
@@ -2,8 +2,11 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import optuna
+import os
 import time
-from backend.tuning import inner_cv_objective, outer_cv_objective, evaluate_model
+from backend.obs_group import update_artifact
+from backend.tuning import (inner_cv_objective, outer_cv_objective, evaluate_model, optimize_parallel,
+                            create_parallel_sampler)
 from frontend.chart import display_study_results, plot_confusion_matrix
 
 def create_param_input(param_name, default_value, input_type, default_radio="Yes", **kwargs):
@@ -46,6 +49,9 @@ def tuning():
             st.write('**Hyperparameter Tuning**')
             n_trials = st.slider("Specify Number of Optimization Trials", min_value=5, max_value=1000, value=10, step=1)
             cv_type = st.selectbox("Select Cross-Validation Loop to get Testing Data", ["Inner Cross-Validation", "Outer Cross-Validation"])
+            n_jobs = st.number_input("Parallel Trials", min_value=1, max_value=os.cpu_count() or 1, value=1, step=1,
+                                     help="Worker processes running trials concurrently, 1 runs the trials in turn "
+                                          "with all cores per model")
 
             features = st.multiselect('Select Input Features to use',
                                       st.session_state.all_features,
@@ -127,28 +133,46 @@ def tuning():
                                                          f"Elapsed Time: {time.strftime('%H:%M:%S', time.gmtime(elapsed_time))} | "
                                                          f"Estimated Remaining Time: {time.strftime('%H:%M:%S', time.gmtime(estimated_remaining_time))}")
 
-                study = optuna.create_study(direction='maximize')
-
-                if cv_type == "Inner Cross-Validation":
-                    first_fold = folds[0]
-                    X_train_first, y_train_first = first_fold['X_train'][features], first_fold['y_train']
-
-                    study.optimize(lambda trial: inner_cv_objective(
-                        trial, X_train_first, y_train_first, inner_cv, param_ranges
-                    ), n_trials=n_trials, callbacks=[update_progress_bar])
-
-                elif cv_type == "Outer Cross-Validation":
-                    study.optimize(lambda trial: outer_cv_objective(
-                        trial, folds, features, param_ranges
-                    ), n_trials=n_trials, callbacks=[update_progress_bar])
-
-                st.session_state.optuna_study = study
+                # Parallel trials are asked while others are still running, the sampler has to account for them
+                study = optuna.create_study(direction='maximize',
+                                            sampler=create_parallel_sampler() if n_jobs > 1 else None)
+
+                try:
+                    if n_jobs > 1:
+                        optimize_parallel(study, folds, cv_type, features, param_ranges, inner_cv, n_trials, n_jobs,
+                                          callbacks=[update_progress_bar])
+
+                    elif cv_type == "Inner Cross-Validation":
+                        first_fold = folds[0]
+                        X_train_first, y_train_first = first_fold.X_train(features), first_fold.y_train()
+                        coords_train_first = first_fold.coords_train()
+
+                        study.optimize(lambda trial: inner_cv_objective(
+                            trial, X_train_first, y_train_first, inner_cv, param_ranges, coords_train_first, n_jobs=-1
+                        ), n_trials=n_trials, callbacks=[update_progress_bar])
+
+                    elif cv_type == "Outer Cross-Validation":
+                        study.optimize(lambda trial: outer_cv_objective(
+                            trial, folds, features, param_ranges, n_jobs=-1
+                        ), n_trials=n_trials, callbacks=[update_progress_bar])
+                except ValueError as e:
+                    # E.g. spatial blocks or buffers that leave a split of the inner loop empty
+                    progress_bar.empty()
+                    st.error(f"Hyperparameter tuning failed: {e}", icon="⚠")
+                    return
 
                 progress_bar.empty()
 
+                # Failed parallel trials keep their exception, see optimize_parallel
+                if not study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)):
+                    errors = [trial.user_attrs['error'] for trial in study.trials if 'error' in trial.user_attrs]
+                    st.error("No trial completed." + (f" First error: {errors[0]}" if errors else ""), icon="⚠")
+                    return
+
                 with st.spinner('Evaluating best model ...'):
-                    st.session_state.best_params = study.best_params
-                    st.session_state.model_evaluation_results = evaluate_model(folds, st.session_state.best_params)
+                    # Recorded as artifact of the current folds, dropped when the samples change
+                    update_artifact(None, 'models', optuna_study=study, best_params=study.best_params,
+                                    model_evaluation_results=evaluate_model(folds, study.best_params))
 
     # Display results
     # ... [rest of the code remains the same] ...